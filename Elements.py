@@ -1,4 +1,7 @@
 
+# Largest number of rows or columns that can be typed into an InputBox
+MAX_SIZE = 99999
+
 
 # Represents an object on the display screen, superclass for all other display objects
 class Element:
@@ -21,23 +24,6 @@ class Element:
         self.__color = color
 
 
-# Represents an individual cell of the maze on the display
-class Square(Element):
-
-    # @ param  rect - pygame Rect object
-    # @ param color - tuple containing RGB values of the element's color
-    # @ param     i - ordinal row value of the cell
-    # @ param     j - ordinal column value of the cell
-    def __init__(self, rect, color, i, j):
-        super().__init__(rect, color)
-        self.__i = i
-        self.__j = j
-
-    # @ return - tuple containing the coordinate pair of the cell
-    def get_position(self):
-        return self.__i, self.__j
-
-
 # Represents a text box on the display
 class TextBox(Element):
 
@@ -138,9 +124,9 @@ class InputBox(ToggleButton):
                 if val < 2:
                     val = 2
                     self.set_text('2')
-                elif val > 670:
-                    val = 670
-                    self.set_text('670')
+                elif val > MAX_SIZE:
+                    val = MAX_SIZE
+                    self.set_text(str(MAX_SIZE))
             else:
                 val = 2
                 self.set_text('2')
@@ -155,7 +141,7 @@ class InputBox(ToggleButton):
     # Handles text input while the object is active
     # @ param character - unicode representation of the key pressed
     def handle_key(self, character: str):
-        if len(self) == 3:
+        if len(self) == len(str(MAX_SIZE)):
             return
         if character.isnumeric():
             self.set_text(str(self) + character)
@@ -1,29 +1,134 @@
-from random import randint
+from array import array
+from heapq import heappop, heappush
+from itertools import count
+from random import getrandbits
+import numpy as np
+from grid import CLEAR, WALL, add_terrain, label_components
+import mazefile
+from generators import GENERATORS, PERFECT, STREAMS, pick_rooms
+from hpa import ClusterGraph
+from jps import JumpPointSearch, JumpTables
+from landmarks import LANDMARKS, Landmarks
+from lpa import LifelongPlanner
+from stats import Stats, profile
+from wavefront import FieldCache, distance_field, walk_back
+from weighted import WeightedSearch
+
+# Flag the bidirectional mode stores in Maze.visited for cells reached from the end
+BACKWARD = 2
+
+# Number of times the walls of a connected maze are drawn before giving up on finding an end the start can reach
+DRAWS = 100
+
+# Names of the algorithms Maze.solve can use, mapped to the Maze method that runs each of them
+MODES = {'best-first':    'best_first',
+         'wavefront':     'wavefront',
+         'jps':           'jump_point',
+         'bidirectional': 'bidirectional',
+         'field':         'cached_field',
+         'hpa':           'hierarchical',
+         'lpa':           'lifelong',
+         'alt':           'landmark',
+         'dial':          'weighted'}
+
+
+# Receives the events emitted while solving a maze, the base class ignores every event
+class Observer:
+
+    # Called once before each path is advanced, allows a display to handle its own events
+    def step(self):
+        pass
+
+    # Called when a cell is added to the frontier
+    # @ param        i - ordinal row value of the cell
+    # @ param        j - ordinal column value of the cell
+    # @ param backward - True if the cell was reached by a search running from the end back to the start
+    def explore(self, i, j, backward=False):
+        pass
+
+    # Called once the end is reached
+    # @ param solution - list of tuples containing the coordinate pairs of all cells from the solution
+    def solved(self, solution):
+        pass
 
 
 class Maze:
 
-    # @ param   height - number of rows in the maze
-    # @ param    width - number of columns in the maze
-    # @ param   engine - graphics engine object
-    # @ param max_path - maximum number of paths the algorithm will advance on each iteration
-    # @  attr     maze - 2D array containing ints representing the Maze
-    # @  attr    start - coordinates of the start point
-    # @  attr      end - coordinates of the end point
-    # @  attr solution - list of the coordinates used to traverse the shortest path
-    # @  attr  checked - list of coordinates checked while solving the maze
-    # @  attr    paths - list of each active path being checked while solving the maze
-    def __init__(self, height, width, engine, max_path=16):
+    # @ param     height - number of rows in the maze
+    # @ param      width - number of columns in the maze
+    # @ param   observer - Observer object notified of solver events, None to solve without a display
+    # @ param   max_path - maximum number of paths the algorithm will advance on each iteration
+    # @ param       mode - name of the algorithm used to solve the maze, one of MODES
+    # @ param  connected - pass True to always place the start and end in the same region of the maze
+    # @ param     fields - maximum number of distance fields cached for path queries on the current maze
+    # @ param    density - chance of each cell in a new maze being a wall
+    # @ param  generator - name of the algorithm new mazes are built with, one of GENERATORS
+    # @ param    terrain - chance of each clear cell in a new maze being mud or water, whose extra cost only
+    #                      the dial and lpa modes and the repairs after wall edits count
+    # @ param      stats - Stats object the counters and timers of every build and solve are added to, None for a
+    #                      new one
+    # @  attr       maze - 2D uint8 array containing the cell codes of the Maze
+    # @  attr      cells - flat view of the maze indexed by row * width + col, used while solving
+    # @  attr       seed - seed the current maze was generated from
+    # @  attr        rng - numpy Generator object used to generate the maze
+    # @  attr components - 2D array labelling the region of clear cells each cell belongs to, -1 for walls, None
+    #                      until relabelled after a wall is toggled
+    # @  attr      start - coordinates of the start point
+    # @  attr        end - coordinates of the end point
+    # @  attr   solution - list of the coordinates used to traverse the shortest path
+    # @  attr    visited - bytearray flagging each cell checked while solving the maze, indexed by row * width + col,
+    #                      the bidirectional mode flags cells reached from the end with BACKWARD
+    # @  attr   explored - number of cells checked while solving the maze, excluding the start
+    # @  attr   expanded - number of cells or jump points whose moves were generated while solving the maze
+    # @  attr       peak - largest number of paths waiting in the frontier at once while solving the maze
+    # @  attr    parents - array holding the index of the cell each checked cell was reached from
+    # @  attr      paths - heap of the last cell of each active path being checked while solving the maze
+    # @  attr      order - counter that breaks distance ties between paths in the order they were created
+    # @  attr  distances - 2D array of each cell's distance from the start, filled by the wavefront mode
+    # @  attr     tables - JumpTables object for the current maze, built the first time the jps mode runs
+    # @  attr      cache - FieldCache object answering path queries on the current maze
+    # @  attr      graph - ClusterGraph object for the current maze, built the first time the hpa mode runs
+    # @  attr  landmarks - Landmarks object for the current maze, None until preprocessed or the alt mode runs, once
+    #                      set every heuristic estimate uses it
+    # @  attr    planner - LifelongPlanner object kept between wall edits, None until the lpa mode runs or a
+    #                      solution is repaired
+    # @  attr heuristics - number of heuristic estimates made while solving the maze
+    # @  attr    profile - path the next solve dumps a cProfile profile to, None to solve without profiling
+    def __init__(self, height, width, observer=None, max_path=16, mode='best-first', connected=False,
+                 fields=8, density=1 / 3, generator='noise', terrain=0.0, stats=None):
         self.height = height
         self.width = width
-        self.engine = engine
+        self.observer = observer if observer else Observer()
         self.max_paths = max_path
-        self.maze = []
+        self.mode = mode
+        self.connected = connected
+        self.density = density
+        self.generator = generator
+        self.terrain = terrain
+        self.stats = stats if stats else Stats()
+        self.maze = np.zeros((0, 0), dtype=np.uint8)
+        self.cells = memoryview(self.maze.reshape(-1))
+        self.seed = None
+        self.rng = np.random.default_rng()
+        self.components = np.zeros((0, 0), dtype=np.int32)
         self.start = (0, 0)
         self.end = (0, 0)
         self.solution = []
-        self.checked = []
+        self.visited = bytearray()
+        self.explored = 0
+        self.expanded = 0
+        self.peak = 0
+        self.parents = array('i')
         self.paths = []
+        self.order = count()
+        self.distances = None
+        self.tables = None
+        self.cache = FieldCache(fields)
+        self.graph = None
+        self.landmarks = None
+        self.planner = None
+        self.heuristics = 0
+        self.profile = None
 
     # Updates the dimensions of the maze
     # @ param height - number of desired rows in the maze
@@ -31,28 +136,138 @@ class Maze:
     def set_dimensions(self, height, width):
         self.height = height
         self.width = width
+        # Cached fields can't describe a maze of another size
+        self.cache.clear()
 
     # Clears memory involved in solving the maze
     def clear_solution(self):
         self.solution = []
-        self.checked = [self.start]
+        start = self.start[0] * self.width + self.start[1]
+        self.visited = bytearray(self.height * self.width)
+        self.visited[start] = 1
+        self.explored = 0
+        self.expanded = 0
+        self.peak = 1
+        self.heuristics = 0
+        # A cell's parent is only read after the cell is checked, so the array starts zeroed
+        self.parents = array('i', bytes(4 * self.height * self.width))
+        self.order = count()
+        self.distances = None
+        self.planner = None
         # Start one path at the starting coordinate
-        self.paths = [[self.distance(self.start), [self.start]]]
+        self.paths = [(self.distance(self.start), next(self.order), start)]
 
     # Constructs a new randomly generated maze
+    # @  param      seed - seed for the random number generator, None to pick a new one
     # @ return self.maze - newly constructed maze
-    def build_maze(self):
-        # Each cell in the maze has a 2/3 chance of being a clear spot, and 1/3 chance of being a wall
-        self.maze = [[0 if randint(0, 2) else 1 for _ in range(self.width)] for _ in range(self.height)]
-        # Chose a random cell to start in and place an 'S' there
-        self.start = i, j = self.get_rand()
-        self.maze[i][j] = 'S'
-        # Chose a random cell to end in and place an 'E' there
-
-        self.end = i, j = self.get_rand(False)
-        self.maze[i][j] = 'E'
+    def build_maze(self, seed=None):
+        self.stats.builds += 1
+        with self.stats.timer('build_seconds'):
+            self.seed = getrandbits(32) if seed is None else seed
+            self.rng = np.random.default_rng(self.seed)
+            if self.generator in PERFECT:
+                # Every room of a perfect maze reaches every other, so the start and end can be picked up front and
+                # are always connected
+                self.start, self.end = pick_rooms(self.rng, self.height, self.width)
+                self.maze = GENERATORS[self.generator](self.rng, self.height, self.width, self.density)
+                self.add_terrain()
+                # Room 0 is always clear, and every clear cell is in its region
+                self.use_maze(self.maze, self.start, self.end, np.where(self.maze == WALL, -1, 0).astype(np.int32))
+                return self.maze
+            for _ in range(DRAWS):
+                # Each cell in the maze is a wall with a chance of self.density, by default 1/3
+                self.maze = GENERATORS[self.generator](self.rng, self.height, self.width, self.density)
+                # Chose a random cell to start in and make sure it's clear
+                self.start = self.get_rand()
+                self.maze[self.start] = CLEAR
+                if not self.connected:
+                    # Chose a random cell to end in and make sure it's clear
+                    self.end = self.get_rand(False)
+                    self.maze[self.end] = CLEAR
+                    self.components = label_components(self.maze)
+                    break
+                # Chose a random cell to end in from the region the start is in
+                self.components = label_components(self.maze)
+                region = np.flatnonzero(self.components.reshape(-1) == self.components[self.start])
+                rows, cols = np.divmod(region, self.width)
+                region = region[np.abs(rows - self.start[0]) + np.abs(cols - self.start[1]) > 1]
+                if region.size:
+                    self.end = divmod(int(region[self.rng.integers(region.size)]), self.width)
+                    break
+                # The start is walled into a region too small to hold the end, so draw new walls
+            else:
+                raise ValueError(f'no end could be reached from the start in {DRAWS} draws of a {self.height}x'
+                                 f'{self.width} maze with wall density {self.density}')
+            self.add_terrain()
+            self.use_maze(self.maze, self.start, self.end, self.components)
+        return self.maze
+
+    # Scatters mud and water over the clear cells of a newly built maze, keeping the start and end clear
+    def add_terrain(self):
+        # Mazes without terrain skip the draw, so they come out the same for a seed as before terrain existed
+        if self.terrain:
+            add_terrain(self.rng, self.maze, self.terrain)
+            self.maze[self.start] = CLEAR
+            self.maze[self.end] = CLEAR
+
+    # Replaces the maze, dropping everything worked out about the previous one
+    # @  param       maze - 2D uint8 array of cell codes
+    # @  param      start - coordinate pair of the start point
+    # @  param        end - coordinate pair of the end point
+    # @  param components - region labels of the maze, None to label it here
+    def use_maze(self, maze, start, end, components=None):
+        self.height, self.width = maze.shape
+        # The flat views of the cells below have to share memory with the maze, or wall edits would never reach them
+        self.maze = np.ascontiguousarray(maze)
+        self.start = start
+        self.end = end
+        self.components = label_components(self.maze) if components is None else components
+        self.cells = memoryview(self.maze.reshape(-1))
+        self.tables = None
+        self.graph = None
+        self.landmarks = None
+        self.cache.clear()
         # New maze requires a clear memory
         self.clear_solution()
+
+    # Picks landmarks for the current maze, so every later solve on it estimates distances along the walls instead of
+    # straight through them
+    # @ param count - number of landmarks to pick
+    def preprocess(self, count=LANDMARKS):
+        with self.stats.timer('build_seconds'):
+            self.landmarks = Landmarks(self.maze, self.components, count)
+
+    # Saves the maze to a bit packed maze file
+    # @ param path - path of the file to write
+    def save(self, path):
+        mazefile.save(path, self.maze, self.start, self.end, self.seed, self.density, self.connected, self.generator)
+
+    # Generates a maze a row at a time straight into a maze file, without ever holding the whole maze, loading the
+    # file back gives the same walls build_maze makes from the seed. Streamed files only hold walls, so no terrain is
+    # added to them even when self.terrain is set.
+    # @  param path - path of the file to write
+    # @  param seed - seed for the random number generator, None to pick a new one
+    # @ return seed - seed the maze was generated from
+    def stream(self, path, seed=None):
+        if self.generator not in STREAMS:
+            raise ValueError(f'the {self.generator} generator can\'t stream, expected one of {", ".join(STREAMS)}')
+        seed = getrandbits(32) if seed is None else seed
+        rng = np.random.default_rng(seed)
+        start, end = pick_rooms(rng, self.height, self.width)
+        rows = STREAMS[self.generator](rng, self.height, self.width)
+        mazefile.stream(path, rows, self.height, self.width, start, end, seed, self.density, True, self.generator)
+        return seed
+
+    # Loads a maze saved by Maze.save, replacing the current maze
+    # @  param      path - path of the file to read
+    # @ return self.maze - newly loaded maze
+    def load(self, path):
+        file = mazefile.MazeFile(path)
+        self.seed = file.seed
+        self.density = file.density
+        self.connected = file.connected
+        self.generator = file.generator
+        self.use_maze(file.grid(), file.start, file.end)
         return self.maze
 
     # Get a random coordinate pair from the maze
@@ -60,7 +275,7 @@ class Maze:
     # @ return  rand - tuple of ints representing a random coordinate pair in the maze
     def get_rand(self, start=True):
         if start:
-            return randint(0, self.height - 1), randint(0, self.width - 1)
+            return int(self.rng.integers(self.height)), int(self.rng.integers(self.width))
         else:
             # Loop until the recursive call returns good coordinates
             rand = self.get_rand()
@@ -68,55 +283,342 @@ class Maze:
                 rand = self.get_rand()
             return rand
 
-    # Solve the maze by finding the shortest path from start to end
+    # Selects the algorithm new mazes are built with
+    # @ param generator - name of the algorithm, one of GENERATORS
+    def set_generator(self, generator):
+        if generator not in GENERATORS:
+            raise ValueError(f'unknown generator {generator!r}, expected one of {", ".join(GENERATORS)}')
+        self.generator = generator
+
+    # Selects the algorithm used to solve the maze
+    # @ param mode - name of the algorithm, one of MODES
+    def set_mode(self, mode):
+        if mode not in MODES:
+            raise ValueError(f'unknown solving mode {mode!r}, expected one of {", ".join(MODES)}')
+        self.mode = mode
+
+    # Solve the maze by finding a path from start to end with the selected algorithm
     # return  True - if a solution to the maze is found
     # return False - if no solution is found
     def solve(self):
+        # The region labels already tell if the end can be reached, so don't search a maze that can't be solved
+        if not self.maze.size or not self.reachable():
+            return False
+        method = getattr(self, MODES[self.mode])
+        with self.stats.timer('search_seconds'):
+            if self.profile:
+                # Only profile the one solve the hook was set for
+                path, self.profile = self.profile, None
+                solved = profile(path, method)
+            else:
+                solved = method()
+        self.stats.add_solve(self)
+        return solved
+
+    # Determines if there is a path between two cells using the region labels made while building the maze
+    # @  param    a - coordinate pair of the first cell, None for the start
+    # @  param    b - coordinate pair of the second cell, None for the end
+    # @ return True - if both cells are clear and in the same region
+    def reachable(self, a=None, b=None):
+        if self.components is None:
+            self.components = label_components(self.maze)
+        label = self.components[self.start if a is None else a]
+        return bool(label >= 0 and label == self.components[self.end if b is None else b])
+
+    # Solve the maze by always advancing the paths that end closest to the end point
+    # return  True - if a solution to the maze is found
+    # return False - if no solution is found
+    def best_first(self):
         # Loop as long as there are valid paths to check
         while self.paths:
             # Only allow the algorithm to advance a number of paths <= self.max_paths
             num_paths = min(len(self.paths), self.max_paths)
-            # Sort the paths by their distance from the end position
-            self.paths = sorted(self.paths, key=lambda lst: lst[0])
+            # New paths are held back until the batch is done so they can't be advanced in the same iteration
+            new_paths = []
             for _ in range(num_paths):
-                self.engine.event_loop()
-                path = self.paths.pop(0)[1]
-                i, j = path[-1]
+                self.observer.step()
+                # The heap is keyed on distance from the end position, then on the order the paths were created
+                index = heappop(self.paths)[2]
+                i, j = divmod(index, self.width)
+                self.expanded += 1
                 # Loop for each valid move from the most recent move on the path
                 for row, col in self.get_directions(i, j):
-                    if self.maze[row][col] == 'E':
-                        # Only use coordinates beyond the starting point to prevent that cell from turning gold
-                        self.solution = path[1:]
-                        self.engine.draw_solution(self.solution)
+                    if (row, col) == self.end:
+                        self.solution = self.trace(index)
+                        self.observer.solved(self.solution)
                         return True
-                    # Create a new path consisting of this move and the rest of the path
-                    self.paths.append([self.distance((row, col)), path + [(row, col)]])
-                    self.checked.append((row, col))
-                    # Turn this square blue
-                    self.engine.update_square(row, col)
+                    # Extend the path by this move, the rest of the path is remembered through its parent
+                    cell = row * self.width + col
+                    new_paths.append((self.distance((row, col)), next(self.order), cell))
+                    self.visited[cell] = 1
+                    self.parents[cell] = index
+                    self.explored += 1
+                    self.observer.explore(row, col)
+            for path in new_paths:
+                heappush(self.paths, path)
+            self.peak = max(self.peak, len(self.paths))
         return False
 
+    # Solve the maze by advancing best first paths from the start and the end in turn until the two searches meet,
+    # each one heading for the cell the other search advanced most recently
+    # return  True - if a solution to the maze is found
+    # return False - if no solution is found
+    def bidirectional(self):
+        start = self.start[0] * self.width + self.start[1]
+        end = self.end[0] * self.width + self.end[1]
+        self.visited[end] = BACKWARD
+        searches = ((self.paths, 1), ([(self.distance(self.end, self.start), next(self.order), end)], BACKWARD))
+        # Aiming at the other search's latest cell rather than its root pulls the two frontiers towards each other
+        heads = {1: self.start, BACKWARD: self.end}
+        # Loop as long as both searches have valid paths to check, a search that runs out can't meet the other
+        while searches[0][0] and searches[1][0]:
+            for paths, side in searches:
+                target = heads[BACKWARD if side == 1 else 1]
+                num_paths = min(len(paths), self.max_paths)
+                new_paths = []
+                for _ in range(num_paths):
+                    self.observer.step()
+                    index = heappop(paths)[2]
+                    i, j = divmod(index, self.width)
+                    heads[side] = i, j
+                    self.expanded += 1
+                    for row, col in self.get_moves(i, j):
+                        cell = row * self.width + col
+                        if self.visited[cell] == side:
+                            continue
+                        if self.visited[cell]:
+                            # The searches met, join the path from the start with the path back from the end
+                            forward, backward = (index, cell) if side == 1 else (cell, index)
+                            self.solution = self.trace(forward, start) + self.trace(backward, end)[::-1]
+                            self.observer.solved(self.solution)
+                            return True
+                        new_paths.append((self.distance((row, col), target), next(self.order), cell))
+                        self.visited[cell] = side
+                        self.parents[cell] = index
+                        self.explored += 1
+                        self.observer.explore(row, col, side == BACKWARD)
+                for path in new_paths:
+                    heappush(paths, path)
+            self.peak = max(self.peak, len(searches[0][0]) + len(searches[1][0]))
+        return False
+
+    # Solve the maze from a cached distance field, growing a new field only if neither the start or end has one
+    # return  True - if a solution to the maze is found
+    # return False - if no solution is found
+    def cached_field(self):
+        path = self.query(guided=False)
+        # Growing a field generates the neighbours of every cell it reaches, while a cached field costs no search
+        self.expanded = self.explored = self.cache.reached
+        self.peak = max(self.peak, self.cache.widest)
+        if path is None:
+            return False
+        self.solution = path
+        self.observer.solved(self.solution)
+        return True
+
+    # Finds a shortest path between any two cells of the maze without disturbing the current solution
+    # @  param      a - coordinate pair the path leaves from, None for the start
+    # @  param      b - coordinate pair the path arrives at, None for the end
+    # @  param guided - False to grow a field on a cache miss even once the landmarks are preprocessed
+    # @ return   path - list of coordinate pairs strictly between the two cells, None if there is no path
+    def query(self, a=None, b=None, guided=True):
+        a = self.start if a is None else a
+        b = self.end if b is None else b
+        if not self.reachable(a, b):
+            return None
+        if a == b:
+            return []
+        cached = a in self.cache.fields or b in self.cache.fields
+        if guided and self.landmarks is not None and not cached:
+            # Once preprocessed, a search guided by the landmarks touches far fewer cells than growing a new field, but
+            # walking a field already grown for either cell is cheaper still
+            return self.landmarks.search(a, b)[:-1]
+        return self.cache.path(self.maze, a, b)
+
+    # Solve the maze breadth first, expanding the whole frontier at once so the solution is a shortest path
+    # return  True - if a solution to the maze is found
+    # return False - if no solution is found
+    def wavefront(self):
+        self.distances = distance_field(self.maze, self.start, self.end, self.explore_layer)
+        path = walk_back(self.distances, self.end)
+        # Every cell closer to the start than the end had its neighbours generated
+        reached = self.distances >= 0
+        if path is not None:
+            reached &= self.distances < len(path)
+        self.expanded = int(np.count_nonzero(reached))
+        if path is None:
+            return False
+        # Leave the end point off the solution to prevent that cell from turning gold
+        self.solution = path[:-1]
+        self.observer.solved(self.solution)
+        return True
+
+    # Solve the maze with Jump Point Search, only expanding the cells where an optimal path could have to turn
+    # return  True - if a solution to the maze is found
+    # return False - if no solution is found
+    def jump_point(self):
+        # The jump tables only depend on the walls, so they are kept for every later solve on this maze
+        if self.tables is None:
+            self.tables = JumpTables(self.maze)
+        search = JumpPointSearch(self.maze, self.start, self.end, self.explore_node, self.tables)
+        return self.finish(search, search.search())
+
+    # Solve the maze with A*, bounding the distance left with landmark distances as well as the Manhattan distance
+    # return  True - if a solution to the maze is found
+    # return False - if no solution is found
+    def landmark(self):
+        # Like the jump tables, the landmarks only depend on the walls and are kept for every later solve
+        if self.landmarks is None:
+            self.landmarks = Landmarks(self.maze, self.components)
+        return self.finish(self.landmarks, self.landmarks.search(self.start, self.end, self.explore_node))
+
+    # Solve the maze with A* on Dial's bucket queue, counting the cost of crossing mud and water
+    # return  True - if a solution to the maze is found
+    # return False - if no solution is found
+    def weighted(self):
+        search = WeightedSearch(self.maze, self.start, self.end, self.explore_node)
+        return self.finish(search, search.dial())
+
+    # Solve the maze hierarchically, searching a graph of the transitions between clusters of the maze and then only
+    # the clusters along the route it finds
+    # return  True - if a solution to the maze is found
+    # return False - if no solution is found
+    def hierarchical(self):
+        # Like the jump tables, the cluster graph only depends on the walls and is kept for every later solve
+        if self.graph is None:
+            self.graph = ClusterGraph(self.maze)
+        return self.finish(self.graph, self.graph.path(self.start, self.end, self.explore_node))
+
+    # Solve the maze with Lifelong Planning A*, keeping the planner so the solution can be repaired after walls are
+    # toggled instead of solving again from scratch
+    # return  True - if a solution to the maze is found
+    # return False - if no solution is found
+    def lifelong(self):
+        self.planner = LifelongPlanner(self.maze, self.start, self.end)
+        self.planner.compute(self.explore_node)
+        return self.finish(self.planner, self.planner.path())
+
+    # Toggles a cell between clear and wall, dropping everything worked out from the old walls except the planner,
+    # which is told about the edit so it can repair the solution
+    # @  param    i - row value of the cell
+    # @  param    j - col value of the cell
+    # @ return True - if the cell is now a wall
+    def toggle_wall(self, i, j):
+        if (i, j) in (self.start, self.end):
+            raise ValueError('the start and end can\'t be walled')
+        self.maze[i, j] = CLEAR if self.maze[i, j] == WALL else WALL
+        # Relabelling costs a pass over the whole maze, so leave it until the labels are next needed
+        self.components = None
+        self.tables = None
+        self.graph = None
+        # Opening a wall can shorten distances, which would leave the landmark bounds too high
+        self.landmarks = None
+        self.cache.clear()
+        if self.planner:
+            self.planner.edit(i, j)
+        return self.maze[i, j] == WALL
+
+    # Repairs the solution after walls were toggled, only revisiting the cells the edits made a difference to, the
+    # observer isn't told since the caller knows which cells it changed
+    # return  True - if a solution to the maze is found
+    # return False - if no solution is found
+    def repair(self):
+        if self.planner is None:
+            # The solution came from another mode, so the planner has to search the whole maze once first
+            self.planner = LifelongPlanner(self.maze, self.start, self.end)
+        before = self.planner.expanded
+        self.planner.compute()
+        self.expanded = self.planner.expanded - before
+        path = self.planner.path()
+        self.solution = [] if path is None else path[:-1]
+        return path is not None
+
+    # Takes the counters and path of a search run by one of the other solvers as the solve's own
+    # @  param search - object that ran the search, with expanded, peak and heuristics counters
+    # @  param   path - list of coordinate pairs from the cell after the start up to the end, None if unreachable
+    # @ return   True - if a solution to the maze is found
+    def finish(self, search, path):
+        self.expanded = search.expanded
+        self.peak = search.peak
+        self.heuristics = search.heuristics
+        if path is None:
+            return False
+        # Leave the end point off the solution to prevent that cell from turning gold
+        self.solution = path[:-1]
+        self.observer.solved(self.solution)
+        return True
+
+    # Reports a cell or node pushed onto the open list by one of the other solvers to the observer
+    # @ param i - row value of the cell
+    # @ param j - col value of the cell
+    def explore_node(self, i, j):
+        self.observer.step()
+        self.explored += 1
+        self.observer.explore(i, j)
+
+    # Reports each cell of a newly reached frontier to the observer
+    # @ param layer - array of flat indexes of the cells in the frontier
+    def explore_layer(self, layer):
+        self.observer.step()
+        self.peak = max(self.peak, layer.size)
+        end = self.end[0] * self.width + self.end[1]
+        for cell in layer.tolist():
+            if cell != end:
+                self.explored += 1
+                self.observer.explore(*divmod(cell, self.width))
+
+    # Rebuilds the path leading to a checked cell by following the parent of each cell back to where its search began
+    # @  param    index - index of the last cell on the path
+    # @  param     root - index of the cell the search began from, None for the start
+    # @ return     path - list of coordinate pairs from the cell after the root up to the given cell
+    def trace(self, index, root=None):
+        if root is None:
+            root = self.start[0] * self.width + self.start[1]
+        path = []
+        # Stop before the root to prevent the start or end from turning gold
+        while index != root:
+            path.append(divmod(index, self.width))
+            index = self.parents[index]
+        path.reverse()
+        return path
+
     # Generates valid moves from a given coordinate pair
     # param        i - row value of coordinate pair
     # param        j - col value of coordinate pair
     # yield row, col - Coordinate pair of a valid move from the given coordinates
     def get_directions(self, i, j):
+        for row, col in self.get_moves(i, j):
+            # Verifies this cell hasn't already been checked
+            if not self.visited[row * self.width + col]:
+                yield row, col
+
+    # Generates the moves from a given coordinate pair that don't run into a wall, whether checked or not
+    # param        i - row value of coordinate pair
+    # param        j - col value of coordinate pair
+    # yield row, col - Coordinate pair of a clear cell next to the given coordinates
+    def get_moves(self, i, j):
         # Use min and max to ensure we only get valid indexes in each direction
         move = ((i, min(j + 1, self.width - 1)),   # East
                 (min(i + 1, self.height - 1), j),  # South
                 (i, max(j - 1, 0)),                # West
                 (max(i - 1, 0), j))                # North
         for row, col in move:
-            # Verifies this cell hasn't already been checked, and isn't a wall
-            if (row, col) not in self.checked and self.maze[row][col] != 1:
+            if self.cells[row * self.width + col] != WALL:
                 yield row, col
 
-    # Calculates the Manhattan distance between given coordinates and the end coordinate
+    # Estimates the distance between given coordinates and a target coordinate, the Manhattan distance unless the
+    # maze was preprocessed with landmarks
     # @  param coords - coordinate pair to be checked
-    # @ return        - Manhattan distance
-    def distance(self, coords):
+    # @  param target - coordinate pair to measure to, None for the end coordinate
+    # @ return        - lower bound on the number of moves between the coordinates
+    def distance(self, coords, target=None):
+        self.heuristics += 1
         x1, y1 = coords
-        x2, y2 = self.end
+        x2, y2 = self.end if target is None else target
+        if self.landmarks is not None:
+            # Both bounds never overestimate, so the larger one is the better estimate
+            bound = self.landmarks.estimate(x1 * self.width + y1, x2 * self.width + y2)
+            return max(bound, abs(x1 - x2) + abs(y1 - y2))
         return abs(x1 - x2) + abs(y1 - y2)
 
 
@@ -0,0 +1,121 @@
+from argparse import ArgumentParser, ArgumentTypeError
+from csv import DictWriter
+from itertools import product
+from json import dumps
+from multiprocessing import Pool
+from os import cpu_count
+from sys import stderr, stdout
+from time import perf_counter
+from generators import fits
+from Maze import MODES, Maze
+
+# Fields of each record, in the order they are written
+FIELDS = ('rows', 'cols', 'density', 'seed', 'mode', 'reachable', 'solved', 'length', 'explored', 'expanded',
+          'seconds')
+
+
+# Builds and solves one seeded maze, runs inside a worker process
+# @  param    job - tuple containing the rows, cols, wall density, seed and mode of the maze
+# @ return record - dictionary of the results, keyed by FIELDS
+def solve_one(job):
+    rows, cols, density, seed, mode = job
+    solver = Maze(rows, cols, mode=mode, density=density)
+    solver.build_maze(seed)
+    begin = perf_counter()
+    solved = solver.solve()
+    seconds = perf_counter() - begin
+    # The solution excludes the start and end cells, add them back in for the full path length
+    return {'rows': rows, 'cols': cols, 'density': density, 'seed': seed, 'mode': mode,
+            'reachable': solver.reachable(), 'solved': solved, 'length': len(solver.solution) + 2 if solved else 0,
+            'explored': solver.explored, 'expanded': solver.expanded, 'seconds': seconds}
+
+
+# Generates every combination of the sweep's parameters without holding them all in memory
+# @  param     sizes - list of (rows, cols) tuples
+# @  param densities - list of wall densities
+# @  param     seeds - iterable of seeds, each one builds a maze for every size and density
+# @  param     modes - list of solving mode names
+# @  yield       job - tuple containing the rows, cols, wall density, seed and mode of one maze
+def jobs(sizes, densities, seeds, modes):
+    for (rows, cols), density, seed, mode in product(sizes, densities, seeds, modes):
+        yield rows, cols, density, seed, mode
+
+
+# Solves a stream of jobs on a pool of worker processes, yielding each result as soon as it's ready
+# @  param      jobs - iterable of job tuples as accepted by solve_one
+# @  param processes - number of worker processes, None for one per core
+# @  param chunksize - number of jobs handed to a worker at once, larger chunks cost less to send between processes
+# @  yield    record - dictionary of the results of one maze, in the order they finish
+def sweep(jobs, processes=None, chunksize=16):
+    with Pool(processes) as pool:
+        yield from pool.imap_unordered(solve_one, jobs, chunksize)
+
+
+# Writes records to a file as they arrive, one line each
+# @  param records - iterable of record dictionaries
+# @  param    file - text file object to write to
+# @  param    kind - format of the file, 'csv' or 'jsonl'
+# @ return   count - number of records written
+def write_records(records, file, kind='csv'):
+    writer = None
+    if kind == 'csv':
+        writer = DictWriter(file, FIELDS)
+        writer.writeheader()
+    count = 0
+    for count, record in enumerate(records, 1):
+        if writer:
+            writer.writerow(record)
+        else:
+            file.write(dumps(record) + '\n')
+        # Flush each record so an interrupted sweep keeps everything finished so far
+        file.flush()
+    return count
+
+
+# Parses a size given as ROWSxCOLS, or a single number for a square maze
+# @  param   text - string from the command line
+# @ return        - tuple containing the rows and cols
+def parse_size(text):
+    rows, _, cols = text.lower().partition('x')
+    rows, cols = int(rows), int(cols or rows)
+    # A worker would never finish placing the end of a maze too small for it, stalling the rest of the sweep
+    if not fits('noise', rows, cols):
+        raise ArgumentTypeError(f'a {rows}x{cols} maze is too small to keep the start and end apart')
+    return rows, cols
+
+
+# Parses the command line arguments
+# @  param   argv - list of argument strings, None to read them from sys.argv
+# @ return       - argparse Namespace containing the parsed arguments
+def parse_args(argv=None):
+    parser = ArgumentParser(description='Solve many seeded mazes in parallel and stream the results')
+    parser.add_argument('-s', '--sizes', type=parse_size, nargs='+', default=[(67, 105)],
+                        help='sizes of the mazes as ROWSxCOLS, or a single number for square mazes')
+    parser.add_argument('-d', '--densities', type=float, nargs='+', default=[1 / 3],
+                        help='chance of each cell being a wall')
+    parser.add_argument('-n', '--count', type=int, default=1000, help='number of seeds for each size and density')
+    parser.add_argument('--first-seed', type=int, default=0, help='seed of the first maze, the rest follow it')
+    parser.add_argument('-m', '--modes', nargs='+', choices=MODES, default=['wavefront'],
+                        help='algorithms used to solve each maze, wavefront measures shortest path lengths')
+    parser.add_argument('-p', '--processes', type=int, default=None, help='number of worker processes')
+    parser.add_argument('-f', '--format', choices=('csv', 'jsonl'), default='csv', help='format of the results')
+    parser.add_argument('-o', '--output', default=None, help='file the results are written to, stdout if omitted')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    seeds = range(args.first_seed, args.first_seed + args.count)
+    records = sweep(jobs(args.sizes, args.densities, seeds, args.modes), args.processes)
+    begin = perf_counter()
+    if args.output:
+        with open(args.output, 'w', newline='') as file:
+            count = write_records(records, file, args.format)
+    else:
+        count = write_records(records, stdout, args.format)
+    print(f'Solved {count} mazes on {args.processes or cpu_count()} processes in {perf_counter() - begin:.2f}s',
+          file=stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,333 @@
+from argparse import ArgumentParser
+from json import dumps, loads
+from os import environ
+from platform import platform, python_version
+from time import perf_counter, strftime
+from tracemalloc import get_traced_memory, start, stop
+import numpy as np
+import pygame as pg
+from Maze import MODES, Maze
+from generators import GENERATORS
+from graphics import Engine
+from weighted import WeightedSearch
+
+# Rendering is measured without opening a window
+environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+# Reference copy of the original list based solver, kept to verify and time the heap based frontier against
+# @  param solver - Maze object holding a freshly built maze
+# @ return        - tuple containing the solution, or None if there isn't one, and the number of cells explored
+def legacy_solve(solver):
+    # Rebuild the nested list representation the legacy solver was written for
+    maze = solver.maze.tolist()
+    maze[solver.start[0]][solver.start[1]] = 'S'
+    maze[solver.end[0]][solver.end[1]] = 'E'
+    checked = [solver.start]
+    paths = [[solver.distance(solver.start), [solver.start]]]
+    while paths:
+        num_paths = min(len(paths), solver.max_paths)
+        paths = sorted(paths, key=lambda lst: lst[0])
+        for _ in range(num_paths):
+            path = paths.pop(0)[1]
+            i, j = path[-1]
+            move = ((i, min(j + 1, solver.width - 1)),
+                    (min(i + 1, solver.height - 1), j),
+                    (i, max(j - 1, 0)),
+                    (max(i - 1, 0), j))
+            for row, col in move:
+                if (row, col) in checked or maze[row][col] == 1:
+                    continue
+                if maze[row][col] == 'E':
+                    return path[1:], len(checked) - 1
+                paths.append([solver.distance((row, col)), path + [(row, col)]])
+                checked.append((row, col))
+    return None, len(checked) - 1
+
+
+# Measures the peak memory allocated while running a function
+# @  param func - function to run, called with no arguments
+# @ return      - peak number of bytes allocated by the function
+def peak_memory(func):
+    start()
+    func()
+    peak = get_traced_memory()[1]
+    stop()
+    return peak
+
+
+# Times the heap based frontier against the legacy solver on a square maze
+# @  param   size - number of rows and columns in the maze
+# @  param  value - seed for the random number generator
+# @  param legacy - pass False to skip the legacy solver
+# @ return        - tuple containing the cells explored, then the seconds and peak bytes of the heap based solver
+#                   and of the legacy solver (None if skipped)
+def bench_frontier(size, value, legacy=True):
+    solver = Maze(size, size)
+    solver.build_maze(value)
+    begin = perf_counter()
+    solved = solver.solve()
+    heap_time = perf_counter() - begin
+    heap_solution = solver.solution
+    # Memory is traced in a separate run since tracing slows down the timed one
+    solver.clear_solution()
+    heap_peak = peak_memory(solver.solve)
+    if not legacy:
+        return solver.explored, heap_time, heap_peak, None, None
+    begin = perf_counter()
+    solution, explored = legacy_solve(solver)
+    legacy_time = perf_counter() - begin
+    if (solution is not None) != solved or (solved and solution != heap_solution):
+        raise AssertionError(f'heap and legacy solvers disagree on the {size}x{size} maze with seed {value}')
+    legacy_peak = peak_memory(lambda: legacy_solve(solver))
+    return explored, heap_time, heap_peak, legacy_time, legacy_peak
+
+
+# Times Dial's bucket queue against a binary heap running the same weighted search on a square maze
+# @  param    size - number of rows and columns in the maze
+# @  param    seed - seed the maze is generated from
+# @  param terrain - chance of each clear cell being mud or water
+# @  param    runs - number of timed runs
+# @ return         - tuple containing the cells expanded, then the seconds taken with buckets and with a heap
+def bench_buckets(size, seed, terrain, runs):
+    solver = Maze(size, size, connected=True, terrain=terrain)
+    solver.build_maze(seed)
+    searches = {}
+    times = {}
+    prices = {}
+    for queue in ('dial', 'heap'):
+        searches[queue] = WeightedSearch(solver.maze, solver.start, solver.end)
+        times[queue] = fastest(getattr(searches[queue], queue), runs=runs)
+        prices[queue] = searches[queue].price(getattr(searches[queue], queue)())
+    # Both queues have to find a path of the same cost, though ties may send them through different cells
+    if prices['dial'] != prices['heap']:
+        raise AssertionError(f'buckets and heap disagree on the {size}x{size} maze with seed {seed}')
+    return searches['dial'].expanded, times['dial'], times['heap']
+
+
+# Times a function, keeping the fastest of several runs
+# @  param  func - function to run, called with no arguments
+# @  param setup - function called before each run and left out of the timing, None to skip
+# @  param  runs - number of times to run the function
+# @ return      - seconds taken by the fastest run
+def fastest(func, setup=None, runs=3):
+    best = float('inf')
+    for _ in range(runs):
+        if setup:
+            setup()
+        begin = perf_counter()
+        func()
+        best = min(best, perf_counter() - begin)
+    return best
+
+
+# Benchmarks generating a maze
+# @  param    size - number of rows and columns in the maze
+# @  param   density - chance of each cell being a wall
+# @  param      seed - seed the maze is generated from
+# @  param generator - name of the algorithm the maze is generated with, one of GENERATORS
+# @  param      runs - number of timed runs
+# @ return    record - dictionary of the results
+def bench_generate(size, density, seed, generator, runs):
+    solver = Maze(size, size, density=density, generator=generator)
+    seconds = fastest(lambda: solver.build_maze(seed), runs=runs)
+    peak = peak_memory(lambda: solver.build_maze(seed))
+    return {'bench': 'generate', 'size': size, 'density': density, 'seed': seed, 'generator': generator,
+            'seconds': seconds, 'peak_bytes': peak}
+
+
+# Benchmarks solving a maze with one mode, the start and end are always placed in the same region
+# @  param    size - number of rows and columns in the maze
+# @  param density - chance of each cell being a wall
+# @  param    seed - seed the maze is generated from
+# @  param    mode - name of the algorithm used to solve the maze
+# @  param    runs - number of timed runs
+# @ return  record - dictionary of the results
+def bench_solve(size, density, seed, mode, runs):
+    solver = Maze(size, size, mode=mode, connected=True, density=density)
+    # Rebuild the maze before each run so no mode gets to reuse what an earlier run cached
+    seconds = fastest(solver.solve, lambda: solver.build_maze(seed), runs)
+    solver.build_maze(seed)
+    peak = peak_memory(solver.solve)
+    return {'bench': 'solve', 'size': size, 'density': density, 'seed': seed, 'mode': mode, 'seconds': seconds,
+            'peak_bytes': peak, 'length': len(solver.solution), 'explored': solver.explored,
+            'expanded': solver.expanded, 'peak_frontier': solver.peak}
+
+
+# Benchmarks drawing a maze with the graphics engine
+# @  param   engine - initialized Engine object
+# @  param     size - number of rows and columns in the maze
+# @  param  density - chance of each cell being a wall
+# @  param     seed - seed the maze is generated from
+# @  param     runs - number of timed runs
+# @ return   record - dictionary of the results
+def bench_render(engine, size, density, seed, runs):
+    engine.set_rows(size)
+    engine.set_cols(size)
+    engine.solver.set_dimensions(size, size)
+    engine.solver.density = density
+    engine.maze = engine.solver.build_maze(seed)
+    seconds = fastest(engine.draw_maze, runs=runs)
+    peak = peak_memory(engine.draw_maze)
+    return {'bench': 'render', 'size': size, 'density': density, 'seed': seed, 'seconds': seconds,
+            'peak_bytes': peak}
+
+
+# Runs every benchmark in the suite, writing one JSON record per line to the output file
+# @ param args - argparse Namespace containing the parsed arguments
+def run_suite(args):
+    meta = {'bench': 'meta', 'date': strftime('%Y-%m-%dT%H:%M:%S'), 'python': python_version(),
+            'numpy': np.__version__, 'pygame': pg.version.ver, 'platform': platform()}
+    engine = None
+    if 'render' in args.benches:
+        engine = Engine()
+        engine.initialize()
+    with open(args.output, 'w') as file:
+        file.write(dumps(meta) + '\n')
+        for record in suite_records(args, engine):
+            file.write(dumps(record) + '\n')
+            # Flush as we go so a long run that gets interrupted still leaves usable results
+            file.flush()
+            print(summary(record))
+
+
+# Generates the records of every benchmark selected on the command line
+# @  param   args - argparse Namespace containing the parsed arguments
+# @  param engine - initialized Engine object, None if rendering isn't benchmarked
+# @  yield record - dictionary of the results of one benchmark
+def suite_records(args, engine):
+    for size in args.sizes:
+        for density in args.densities:
+            for seed in args.seeds:
+                if 'generate' in args.benches:
+                    for generator in args.generators:
+                        yield bench_generate(size, density, seed, generator, args.runs)
+                if 'solve' in args.benches:
+                    for mode in args.modes:
+                        yield bench_solve(size, density, seed, mode, args.runs)
+        # Drawing costs the same for any density, so only the first density and seed are rendered
+        if engine:
+            yield bench_render(engine, size, args.densities[0], args.seeds[0], args.runs)
+
+
+# Formats a record as a single line for the console
+# @  param record - dictionary of the results of one benchmark
+# @ return        - string describing the record
+def summary(record):
+    name = f'{record["bench"]:<8} {record["size"]:>4} {record["density"]:.2f} {record["seed"]:>3} ' \
+           f'{record.get("mode", record.get("generator", "")):<13}'
+    line = f'{name} {record["seconds"]:>10.5f}s {record["peak_bytes"] // 1024:>8} KiB'
+    if record['bench'] == 'solve':
+        line += f' {record["expanded"]:>8} expanded {record["peak_frontier"]:>7} peak frontier'
+    return line
+
+
+# Compares the timings of two result files, matching records by benchmark, size, density, seed and mode or generator
+# @ param args - argparse Namespace containing the parsed arguments
+def run_compare(args):
+    old, new = (load_records(path) for path in (args.old, args.new))
+    print(f'{"benchmark":<35} {"old (s)":>10} {"new (s)":>10} {"change":>8}')
+    for key, record in new.items():
+        if key in old:
+            before, after = old[key]['seconds'], record['seconds']
+            print(f'{" ".join(map(str, key)):<35} {before:>10.5f} {after:>10.5f} {after / before:>7.2f}x')
+
+
+# Loads a result file written by the suite
+# @  param    path - path of the file
+# @ return records - dictionary mapping each record's identifying fields to the record
+def load_records(path):
+    records = {}
+    with open(path) as file:
+        for line in file:
+            record = loads(line)
+            if record['bench'] != 'meta':
+                # Records from before generators could be picked were all generated as noise
+                key = (record['bench'], record['size'], round(record['density'], 3), record['seed'],
+                       record.get('mode', record.get('generator', 'noise')))
+                records[key] = record
+    return records
+
+
+# Prints a table timing the heap based frontier against the legacy solver
+# @ param args - argparse Namespace containing the parsed arguments
+def run_frontier(args):
+    print(f'{"size":>9} {"explored":>9} {"heap (s)":>10} {"heap KiB":>10} '
+          f'{"legacy (s)":>11} {"legacy KiB":>11} {"speedup":>8}')
+    for size in args.sizes:
+        explored, heap_time, heap_peak, legacy_time, legacy_peak = bench_frontier(size, args.seed,
+                                                                                  size <= args.legacy_limit)
+        if legacy_time is None:
+            legacy, legacy_kib, speedup = '-', '-', '-'
+        else:
+            legacy, legacy_kib = f'{legacy_time:.4f}', f'{legacy_peak // 1024}'
+            speedup = f'{legacy_time / heap_time:.1f}x'
+        print(f'{f"{size}x{size}":>9} {explored:>9} {heap_time:>10.4f} {heap_peak // 1024:>10} '
+              f'{legacy:>11} {legacy_kib:>11} {speedup:>8}')
+
+
+# Prints a table timing Dial's bucket queue against a binary heap on weighted mazes
+# @ param args - argparse Namespace containing the parsed arguments
+def run_buckets(args):
+    print(f'{"size":>9} {"seed":>5} {"expanded":>9} {"dial (s)":>10} {"heap (s)":>10} {"dial cells/s":>13} '
+          f'{"heap cells/s":>13} {"speedup":>8}')
+    for size in args.sizes:
+        for seed in args.seeds:
+            expanded, dial_time, heap_time = bench_buckets(size, seed, args.terrain, args.runs)
+            print(f'{f"{size}x{size}":>9} {seed:>5} {expanded:>9} {dial_time:>10.4f} {heap_time:>10.4f} '
+                  f'{expanded / dial_time:>13.0f} {expanded / heap_time:>13.0f} {heap_time / dial_time:>7.2f}x')
+
+
+# Parses the command line arguments
+# @  param   argv - list of argument strings, None to read them from sys.argv
+# @ return       - argparse Namespace containing the parsed arguments
+def parse_args(argv=None):
+    parser = ArgumentParser(description='Benchmark maze generation, solving and rendering')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    suite = commands.add_parser('suite', help='run the benchmark suite and write the results as JSON lines')
+    suite.add_argument('-o', '--output', default='benchmark.jsonl', help='file the results are written to')
+    suite.add_argument('-b', '--benches', nargs='+', choices=('generate', 'solve', 'render'),
+                       default=['generate', 'solve', 'render'], help='benchmarks to run')
+    suite.add_argument('-s', '--sizes', type=int, nargs='+', default=[10, 50, 100, 250, 670],
+                       help='number of rows and columns of each benchmarked maze')
+    suite.add_argument('-d', '--densities', type=float, nargs='+', default=[1 / 3, 0.1, 0.25, 0.4],
+                       help='chance of each cell being a wall, rendering only uses the first')
+    suite.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2], help='seeds each maze is built from')
+    suite.add_argument('-g', '--generators', nargs='+', choices=GENERATORS, default=['noise'],
+                       help='maze generators to time')
+    suite.add_argument('-m', '--modes', nargs='+', choices=MODES, default=list(MODES), help='solving modes to run')
+    suite.add_argument('-r', '--runs', type=int, default=3, help='number of timed runs, the fastest is kept')
+    suite.set_defaults(func=run_suite)
+
+    compare = commands.add_parser('compare', help='compare the timings of two result files')
+    compare.add_argument('old', help='result file of the baseline version')
+    compare.add_argument('new', help='result file of the version being checked')
+    compare.set_defaults(func=run_compare)
+
+    frontier = commands.add_parser('frontier', help='time the heap based frontier against the legacy solver')
+    frontier.add_argument('-s', '--sizes', type=int, nargs='+', default=[50, 100, 200, 670],
+                          help='number of rows and columns of each benchmarked maze')
+    frontier.add_argument('--seed', type=int, default=0, help='seed for the random number generator')
+    frontier.add_argument('--legacy-limit', type=int, default=200,
+                          help='largest size the quadratic legacy solver is timed on')
+    frontier.set_defaults(func=run_frontier)
+
+    buckets = commands.add_parser('buckets', help='time the bucket queue against a heap on weighted mazes')
+    buckets.add_argument('-s', '--sizes', type=int, nargs='+', default=[100, 250, 670],
+                         help='number of rows and columns of each benchmarked maze')
+    buckets.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2], help='seeds each maze is built from')
+    buckets.add_argument('-t', '--terrain', type=float, default=0.25,
+                         help='chance of each clear cell being mud or water')
+    buckets.add_argument('-r', '--runs', type=int, default=3, help='number of timed runs, the fastest is kept')
+    buckets.set_defaults(func=run_buckets)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
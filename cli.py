@@ -0,0 +1,97 @@
+from argparse import ArgumentParser
+from os import path
+from random import getrandbits
+from sys import stderr
+from time import perf_counter
+from Maze import MODES, Maze
+from generators import GENERATORS, STREAMS, fits
+from eventlog import EventLog
+
+
+# Parses the command line arguments
+# @ param   argv - list of argument strings, None to read them from sys.argv
+# @ return       - argparse Namespace containing the parsed arguments
+def parse_args(argv=None):
+    parser = ArgumentParser(description='Generate and solve mazes without a display')
+    parser.add_argument('-r', '--rows', type=int, default=67, help='number of rows in each maze')
+    parser.add_argument('-c', '--cols', type=int, default=105, help='number of columns in each maze')
+    parser.add_argument('-n', '--count', type=int, default=1, help='number of mazes to generate and solve')
+    parser.add_argument('-s', '--seed', type=int, default=None,
+                        help='seed of the first maze, incremented for each maze after it')
+    parser.add_argument('-p', '--max-paths', type=int, default=16,
+                        help='maximum number of paths advanced on each iteration')
+    parser.add_argument('-m', '--mode', choices=MODES, default='best-first', help='algorithm used to solve each maze')
+    parser.add_argument('-g', '--generator', choices=GENERATORS, default='noise',
+                        help='algorithm used to generate each maze')
+    parser.add_argument('-t', '--terrain', type=float, default=0.0,
+                        help='chance of each clear cell being mud or water, only the dial and lpa modes and the '
+                             'repairs after wall edits count their cost')
+    parser.add_argument('--landmarks', type=int, metavar='N', default=0,
+                        help='pick N landmarks on each maze before solving it, guiding every search along the walls')
+    parser.add_argument('--connected', action='store_true',
+                        help='always place the start and end in the same region of each maze')
+    parser.add_argument('--save', metavar='DIR', default=None,
+                        help='directory each generated maze and the log of its solve are saved to')
+    parser.add_argument('--stream', action='store_true',
+                        help='write each maze to the --save directory a row at a time without solving it, for mazes '
+                             f'too large to hold in memory, needs one of the {", ".join(STREAMS)} generators')
+    parser.add_argument('--load', metavar='FILE', nargs='+', default=None,
+                        help='solve the given maze files instead of generating new mazes')
+    parser.add_argument('--profile', metavar='FILE', default=None,
+                        help='dump a cProfile profile of the first solve to the given file')
+    parser.add_argument('--stats', action='store_true', help='print the totals of every build and solve once done')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.load and not fits(args.generator, args.rows, args.cols):
+        raise SystemExit(f'a {args.rows}x{args.cols} maze is too small for the {args.generator} generator to keep the '
+                         f'start and end apart')
+    solver = Maze(args.rows, args.cols, max_path=args.max_paths, mode=args.mode, connected=args.connected,
+                  generator=args.generator, terrain=args.terrain)
+    if args.stream:
+        stream(solver, args)
+        return
+    solver.profile = args.profile
+    print('maze,solved,length,explored,expanded,seconds')
+    for n in range(len(args.load) if args.load else args.count):
+        if args.load:
+            solver.load(args.load[n])
+        else:
+            # Each maze gets its own seed so any one of them can be rebuilt on its own
+            solver.build_maze(None if args.seed is None else args.seed + n)
+            if args.save:
+                solver.save(path.join(args.save, f'{solver.seed}.maze'))
+                solver.observer = EventLog()
+        if args.landmarks:
+            solver.preprocess(args.landmarks)
+        begin = perf_counter()
+        solved = solver.solve()
+        elapsed = perf_counter() - begin
+        if args.save and not args.load:
+            solver.observer.complete = True
+            solver.observer.save(path.join(args.save, f'{solver.seed}.log'))
+        # The solution excludes the start and end cells, add them back in for the full path length
+        length = len(solver.solution) + 2 if solved else 0
+        print(f'{n},{solved},{length},{solver.explored},{solver.expanded},{elapsed:.6f}')
+    if args.stats:
+        print(*(f'{name}={value}' for name, value in solver.stats.summary().items()), file=stderr)
+
+
+# Writes each maze straight to a file as it's generated, one file per seed
+# @ param solver - Maze object set up with the generator and dimensions to use
+# @ param   args - argparse Namespace containing the parsed arguments
+def stream(solver, args):
+    if not args.save or args.generator not in STREAMS:
+        raise SystemExit(f'--stream needs --save and one of the {", ".join(STREAMS)} generators')
+    print('maze,seed,seconds')
+    for n in range(args.count):
+        seed = getrandbits(32) if args.seed is None else args.seed + n
+        begin = perf_counter()
+        solver.stream(path.join(args.save, f'{seed}.maze'), seed)
+        print(f'{n},{seed},{perf_counter() - begin:.6f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+from array import array
+from struct import Struct
+from Maze import Observer
+
+# Layout of the header at the start of every log file: magic, version, flags, number of cells explored and number of
+# cells in the solution
+HEADER = Struct('<4sBBQQ')
+MAGIC = b'MLOG'
+VERSION = 1
+# Flags set when the solve ran to the end, and when it found a solution
+COMPLETE = 1
+FOUND = 2
+
+
+# Records the events of one solve in flat arrays, so a log of a few million cells costs a few bytes per cell and any
+# step of it can be read back directly
+class EventLog(Observer):
+
+    # @ attr           rows - array holding the row of each cell explored, in the order they were explored
+    # @ attr           cols - array holding the column of each cell explored
+    # @ attr       backward - bytearray flagging each cell explored by a search running from the end back to the start
+    # @ attr  solution_rows - array holding the row of each cell of the solution
+    # @ attr  solution_cols - array holding the column of each cell of the solution
+    # @ attr          found - True once a solution was recorded
+    # @ attr       complete - True once the solve finished without being cancelled, so the log holds all of it
+    def __init__(self):
+        self.rows = array('i')
+        self.cols = array('i')
+        self.backward = bytearray()
+        self.solution_rows = array('i')
+        self.solution_cols = array('i')
+        self.found = False
+        self.complete = False
+
+    # Records a cell added to the frontier
+    # @ param        i - ordinal row value of the cell
+    # @ param        j - ordinal column value of the cell
+    # @ param backward - True if the cell was reached by a search running from the end back to the start
+    def explore(self, i, j, backward=False):
+        self.rows.append(i)
+        self.cols.append(j)
+        self.backward.append(backward)
+
+    # Records the solution once the end is reached
+    # @ param solution - list of tuples containing the coordinate pairs of all cells from the solution
+    def solved(self, solution):
+        for i, j in solution:
+            self.solution_rows.append(i)
+            self.solution_cols.append(j)
+        self.found = True
+
+    # @ return count - number of steps in the log, one per cell explored and one more for the solution
+    def __len__(self):
+        # The backward flag is appended last, so counting flags never counts a cell another thread is still appending
+        return len(self.backward) + self.found
+
+    # Replays one step of the log onto an observer
+    # @ param observer - Observer object the step is replayed onto
+    # @ param     step - index of the step, from 0 up to the length of the log
+    def replay(self, observer, step):
+        if step < len(self.backward):
+            observer.explore(self.rows[step], self.cols[step], bool(self.backward[step]))
+        else:
+            observer.solved(list(zip(self.solution_rows, self.solution_cols)))
+
+    # Writes the log to a file, usually named after the maze file it was recorded on
+    # @ param path - path of the file to write
+    def save(self, path):
+        flags = (COMPLETE if self.complete else 0) | (FOUND if self.found else 0)
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, flags, len(self.rows), len(self.solution_rows)))
+            for data in self.rows, self.cols, self.backward, self.solution_rows, self.solution_cols:
+                file.write(data)
+
+
+# Reads a log written by EventLog.save
+# @  param path - path of the file to read
+# @ return  log - EventLog object
+def load(path):
+    with open(path, 'rb') as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f'{path} is too short to be a log file')
+        magic, version, flags, explored, length = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a log file')
+        if version != VERSION:
+            raise ValueError(f'{path} uses version {version}, which is unsupported')
+        log = EventLog()
+        try:
+            log.rows.fromfile(file, explored)
+            log.cols.fromfile(file, explored)
+            log.backward.extend(file.read(explored))
+            log.solution_rows.fromfile(file, length)
+            log.solution_cols.fromfile(file, length)
+        except EOFError:
+            raise ValueError(f'{path} ends before the events its header counts') from None
+    log.found = bool(flags & FOUND)
+    log.complete = bool(flags & COMPLETE)
+    return log
@@ -0,0 +1,151 @@
+from array import array
+import numpy as np
+from grid import CLEAR, WALL, random_grid
+
+
+# The perfect maze generators carve passages between rooms on every cell with even row and column, through the cells
+# between them, leaving exactly one path between any two rooms. A grid with an even number of rows or columns keeps
+# its last row or column as solid wall.
+
+# Builds a perfect maze with Kruskal's algorithm, knocking down the walls between rooms in a random order whenever
+# the rooms on either side aren't joined yet, tracked by a union-find over the rooms
+# @  param     rng - numpy Generator object used to order the walls
+# @  param  height - number of rows in the grid
+# @  param   width - number of columns in the grid
+# @  param density - ignored, every cell that isn't a room or passage is a wall
+# @ return    grid - 2D uint8 array of cell codes
+def kruskal(rng, height, width, density=None):
+    rows, cols = (height + 1) // 2, (width + 1) // 2
+    grid = np.full((height, width), WALL, dtype=np.uint8)
+    grid[::2, ::2] = CLEAR
+    # Every pair of rooms next to each other, first horizontally and then vertically
+    index = np.arange(rows * cols, dtype=np.int32).reshape(rows, cols)
+    first = np.concatenate((index[:, :-1].reshape(-1), index[:-1, :].reshape(-1)))
+    second = np.concatenate((index[:, 1:].reshape(-1), index[1:, :].reshape(-1)))
+    order = rng.permutation(first.size)
+    first, second = first[order], second[order]
+    parent = array('i', range(rows * cols))
+
+    # Finds the root of a room's set, halving the path to it on the way
+    def find(room):
+        while parent[room] != room:
+            parent[room] = parent[parent[room]]
+            room = parent[room]
+        return room
+
+    joined = np.zeros(first.size, dtype=bool)
+    for n, (a, b) in enumerate(zip(first.tolist(), second.tolist())):
+        a, b = find(a), find(b)
+        if a != b:
+            parent[b] = a
+            joined[n] = True
+    # The wall between two rooms sits halfway between their grid coordinates, which is the sum of their room ones
+    (ai, aj), (bi, bj) = np.divmod(first[joined], cols), np.divmod(second[joined], cols)
+    grid[ai + bi, aj + bj] = CLEAR
+    return grid
+
+
+# Generates a perfect maze with Eller's algorithm one row of the grid at a time, only keeping the sets of the rooms
+# in the current row, so a maze of any height costs memory proportional to its width
+# @  param    rng - numpy Generator object used to carve the passages
+# @  param height - number of rows in the grid
+# @  param  width - number of columns in the grid
+# @ yield     row - 1D uint8 array of the cell codes of each row of the grid, from the top down
+def eller_rows(rng, height, width):
+    rooms = (width + 1) // 2
+    # Label of the set each room of the current row belongs to, rooms sharing a label are already joined
+    sets = list(range(rooms))
+    parent = []
+
+    # Finds the root of a set, halving the path to it on the way
+    def find(label):
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    for top in range(0, height, 2):
+        last = top + 2 >= height
+        row = np.full(width, WALL, dtype=np.uint8)
+        row[::2] = CLEAR
+        # Relabel the sets from 0 so a union-find over this row's sets fits in a list as long as the row
+        labels = {}
+        sets = [labels.setdefault(label, len(labels)) for label in sets]
+        parent[:] = range(len(labels))
+        # Join neighbouring rooms at random, the last row has to join every set that's left
+        joins = rng.random(rooms - 1) < 0.5
+        for n in range(rooms - 1):
+            a, b = find(sets[n]), find(sets[n + 1])
+            if a != b and (last or joins[n]):
+                parent[b] = a
+                row[2 * n + 1] = CLEAR
+        sets = [find(label) for label in sets]
+        yield row
+        if top + 1 >= height:
+            break
+        below = np.full(width, WALL, dtype=np.uint8)
+        if not last:
+            # Every set carries on down through at least one of its rooms, or it would be cut off from the rest
+            downs = rng.random(rooms) < 0.5
+            members = {}
+            for n, label in enumerate(sets):
+                members.setdefault(label, []).append(n)
+            for cells in members.values():
+                if not downs[cells].any():
+                    downs[cells[rng.integers(len(cells))]] = True
+            below[::2][downs] = CLEAR
+            # Rooms nothing came down into start sets of their own, labelled past any label in use
+            sets = [label if down else rooms + n for n, (label, down) in enumerate(zip(sets, downs.tolist()))]
+        yield below
+
+
+# Builds a perfect maze with Eller's algorithm, holding every row at once
+# @  param     rng - numpy Generator object used to carve the passages
+# @  param  height - number of rows in the grid
+# @  param   width - number of columns in the grid
+# @  param density - ignored, every cell that isn't a room or passage is a wall
+# @ return    grid - 2D uint8 array of cell codes
+def eller(rng, height, width, density=None):
+    return np.array(list(eller_rows(rng, height, width)), dtype=np.uint8).reshape(height, width)
+
+
+# Determines if a generator can build a maze of a given size, a perfect maze needs two rooms to put the start and end
+# in, so it can't be built when both the rows and the columns number only one or two
+# @  param generator - name of the algorithm, one of GENERATORS
+# @  param    height - number of rows in the grid
+# @  param     width - number of columns in the grid
+# @ return      True - if the generator can build the maze
+def fits(generator, height, width):
+    if generator in PERFECT:
+        return (height + 1) // 2 * ((width + 1) // 2) >= 2
+    # Any other maze puts its start on any cell, which needs some cell that isn't next to it for the end. Every cell
+    # of a grid at least 2 by 2 has one, while a single row or column only has them from 4 cells on.
+    return min(height, width) >= 2 or min(height, width) == 1 and max(height, width) >= 4
+
+
+# Picks the start and end of a perfect maze from its rooms, every room can reach every other one
+# @  param    rng - numpy Generator object used to pick the rooms
+# @  param height - number of rows in the grid
+# @  param  width - number of columns in the grid
+# @ return        - tuple containing the coordinate pairs of the start and end
+def pick_rooms(rng, height, width):
+    rows, cols = (height + 1) // 2, (width + 1) // 2
+    if rows * cols < 2:
+        raise ValueError(f'a {height}x{width} perfect maze has only one room, so the start and end can\'t be apart')
+    start = int(rng.integers(rows * cols))
+    end = start
+    while end == start:
+        end = int(rng.integers(rows * cols))
+    (si, sj), (ei, ej) = divmod(start, cols), divmod(end, cols)
+    return (2 * si, 2 * sj), (2 * ei, 2 * ej)
+
+
+# Names of the algorithms Maze.build_maze can use, mapped to the function that builds the grid, each called with the
+# random Generator, height, width and wall density. The order is kept in maze files, so new ones go on the end.
+GENERATORS = {'noise':   random_grid,
+              'kruskal': kruskal,
+              'eller':   eller}
+# Generators whose mazes join every clear cell by exactly one path
+PERFECT = {'kruskal', 'eller'}
+# Generators that can emit a maze a row at a time, mapped to the function doing it
+STREAMS = {'eller': eller_rows}
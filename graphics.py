@@ -1,11 +1,17 @@
+import numpy as np
 import pygame as pg
 import Elements as El
-from Maze import Maze
+from Maze import Maze, Observer
+from generators import GENERATORS, fits
+from worker import EventQueue, SolveWorker
+from tiles import TiledMaze, Tiles
+from stats import Stats
+from grid import CLEAR, COSTS, MUD, WALL, WATER
 from math import floor
-from time import sleep
+from time import perf_counter
 
 
-class Engine:
+class Engine(Observer):
 
     # @ param        height - height in pixels of the window
     # @ param         width - width in pixels of the window
@@ -15,15 +21,43 @@ class Engine:
     # @  attr     font size - size of the font for text displayed on screen
     # @  attr          rows - number of rows in the maze
     # @  attr          cols - number of columns in the maze
-    # @  attr         sleep - number of seconds to sleep after each square is updated
+    # @  attr         speed - number of squares updated on each frame, 0 to update as many as the solver allows
+    # @  attr           fps - number of frames presented per second
+    # @  attr         clock - pygame Clock object used to cap the frame rate
+    # @  attr         dirty - list of Rect objects updated since the last frame was presented
     # @  attr  border_width - width in pixels for border surrounding the display area for the maze
     # @  attr          font - pygame Font object
+    # @  attr    small_font - pygame Font object used for the stats overlay
     # @  attr       display - pygame Surface object
-    # @  attr       squares - dictionary of Square objects
+    # @  attr        shades - dictionary mapping the names of the colors the solver marks cells with to their codes
+    # @  attr       palette - 2D uint8 array holding the RGB color of each cell code, then of each mark code
+    # @  attr         marks - Tiles object holding the mark code of each cell the solver has colored, 0 for none
+    # @  attr        buffer - 3D uint8 array holding the RGB color of each cell in view
+    # @  attr     cell_size - width and height in pixels of each cell of the maze
+    # @  attr      max_zoom - largest width and height in pixels of each cell of the maze
+    # @  attr           top - row of the first cell in view
+    # @  attr          left - column of the first cell in view
+    # @  attr        bottom - row one past the last cell in view
+    # @  attr         right - column one past the last cell in view
+    # @  attr          grab - tuple containing the mouse position, top and left when a drag began, None if not dragging
     # @  attr   input_boxes - list of InputBox objects
     # @  attr speed_buttons - list of SpeedBut objects
-    # @  attr          maze - 2D array of integers representing the maze
-    # @  attr        solver - Maze solver object
+    # @  attr          maze - 2D array of integers representing the maze, or TiledGrid object if it's tiled
+    # @  attr        solver - Maze solver object, or TiledMaze object for mazes too large to show at once
+    # @  attr         stats - Stats object shared with the solver
+    # @  attr    show_stats - True if the stats overlay is shown in the side panel
+    # @  attr    stats_rect - pygame Rect object of the side panel area the stats overlay is drawn in
+    # @  attr   stats_drawn - time the stats overlay was last drawn
+    # @  attr  profile_path - path the solve after pressing P dumps its cProfile profile to
+    # @  attr     generator - name of the algorithm the next maze is built with, one of GENERATORS
+    # @  attr       terrain - chance of each clear cell of the next maze being mud or water
+    # @  attr        events - EventQueue object the solver posts its events to, holding the log of the last solve
+    # @  attr       playing - True while the log is being replayed onto the display
+    # @  attr         shown - list of the coordinate pairs of the solution on display
+    # @  attr      timeline - pygame Rect object of the bar under the maze showing how far the replay has got
+    # @  attr      progress - tuple containing the replay position and log length the timeline was last drawn at
+    # @  attr     scrubbing - True while the timeline is being dragged
+    # @  attr        worker - SolveWorker object running the solver in the background
     def __init__(self, height=720, width=1280):
         self.height = height
         self.width = width
@@ -33,24 +67,57 @@ class Engine:
                        'light_bg': (49,  51,  53),
                        'line':     (60,  63,  65),
                        'clear':    (175, 177, 179),
+                       'mud':      (150, 126, 92),
+                       'water':    (112, 148, 176),
                        'text':     (200, 202, 204),
                        'start':    (145, 4,   4),
                        'end':      (7,   97,  4),
                        'path':     (4,   122, 145),
+                       'reverse':  (122, 63,  145),
                        'solution': (163, 120, 2)}
         self.font_size = 25
         self.rows = 67
         self.cols = 105
-        self.sleep = 0.001
+        self.speed = 16
+        self.fps = 60
+        self.clock = pg.time.Clock()
+        self.dirty = []
         self.border_width = 10
         self.font = None
+        self.small_font = None
         self.display = None
-        self.squares = {}
+        # Mark codes follow on from the cell codes so one palette lookup colors both
+        self.shades = {name: code for code, name in
+                       enumerate(('start', 'end', 'path', 'reverse', 'solution'), len(COSTS))}
+        self.palette = np.zeros((max(self.shades.values()) + 1, 3), dtype=np.uint8)
+        self.marks = Tiles(0, 0)
+        self.buffer = np.zeros((0, 0, 3), dtype=np.uint8)
+        self.cell_size = 0
+        self.max_zoom = 32
+        self.top = 0
+        self.left = 0
+        self.bottom = 0
+        self.right = 0
+        self.grab = None
         self.buttons = []
         self.input_boxes = []
         self.speed_buttons = []
-        self.maze = []
-        self.solver = Maze(self.rows, self.cols, self)
+        self.maze = None
+        self.stats = Stats()
+        self.show_stats = False
+        self.stats_rect = pg.Rect(0, 0, 0, 0)
+        self.stats_drawn = 0.0
+        self.profile_path = 'solve.prof'
+        self.generator = 'noise'
+        self.terrain = 0.0
+        self.events = EventQueue()
+        self.playing = False
+        self.shown = []
+        self.timeline = pg.Rect(25, self.safe_height + 35, self.safe_width, self.height - self.safe_height - 45)
+        self.progress = None
+        self.scrubbing = False
+        self.solver = Maze(self.rows, self.cols, self.events, stats=self.stats)
+        self.worker = SolveWorker(self.solver, self.events)
 
     # Initializes the main display window
     def initialize(self):
@@ -66,6 +133,7 @@ class Engine:
 
         pg.display.flip()
         self.font = pg.font.Font(None, self.font_size)
+        self.small_font = pg.font.Font(None, self.font_size * 3 // 4)
         self.draw_menu()
 
     # Draws all of the UI elements on the screen
@@ -76,7 +144,7 @@ class Engine:
         spacing = 15
         button_color = self.colors['light_bg']
         button_names = ('New Maze', 'Solve', 'Reset')
-        button_funcs = (self.new_maze, self.solver.solve, self.draw_maze)
+        button_funcs = (self.new_maze, self.solve, self.draw_maze)
 
         # Create main control buttons
         for name, func in zip(button_names, button_funcs):
@@ -92,13 +160,13 @@ class Engine:
         self.draw_font(El.TextBox(rect, self.colors['text'], 'Speed'))
         top_edge += spacing * 2
         button_names = ('>', '>>', '>>>', '>>>>', '>>>>>')
-        button_speed = (0.5, 0.1, 0.01, 0.001, 0)
+        button_speed = (1, 2, 4, 16, 0)
 
         # Create speed buttons
         for name, speed in zip(button_names, button_speed):
             rect = pg.Rect(left_edge, top_edge, *button_size)
             active = name == button_names[-2]
-            button = El.SpeedBut(rect, self.colors['clear'], button_color, name, self.set_sleep, active, speed)
+            button = El.SpeedBut(rect, self.colors['clear'], button_color, name, self.set_speed, active, speed)
             self.buttons.append(button)
             self.speed_buttons.append(button)
             self.update(button)
@@ -106,6 +174,10 @@ class Engine:
             self.draw_font(button, color=color)
             top_edge += spacing + button_size[1]
 
+        # Leave room under the speed buttons for the stats overlay, a line for each stat
+        self.stats_rect = pg.Rect(left_edge, top_edge, 160, self.small_font.get_linesize() * len(self.stats.lines()))
+        top_edge += self.stats_rect.height + spacing
+
         rect = pg.Rect(left_edge, top_edge, *button_size)
         self.draw_font(El.TextBox(rect, self.colors['text'], 'Rows'))
         rect = pg.Rect(left_edge + spacing + button_size[0], top_edge, *button_size)
@@ -128,6 +200,8 @@ class Engine:
     def main_loop(self):
         while True:
             self.event_loop()
+            self.drain()
+            self.present()
 
     # Handles the OS event loop
     def event_loop(self):
@@ -135,7 +209,29 @@ class Engine:
             if event.type == pg.QUIT:
                 quit_screen()
 
-            if event.type == pg.MOUSEBUTTONUP:
+            if event.type == pg.MOUSEBUTTONDOWN and event.button == 3:
+                # Only a maze on display can be dragged, and only by grabbing it
+                x, y = event.pos
+                if self.maze is not None and 25 <= x < 25 + self.safe_width and 25 <= y < 25 + self.safe_height:
+                    self.grab = event.pos, self.top, self.left
+            elif event.type == pg.MOUSEBUTTONUP and event.button == 3:
+                self.grab = None
+            elif event.type == pg.MOUSEMOTION and self.grab:
+                # Drag the maze along with the mouse while the right button is held
+                (x, y), top, left = self.grab
+                self.move_view(top - (event.pos[1] - y) // self.cell_size,
+                               left - (event.pos[0] - x) // self.cell_size)
+            elif event.type == pg.MOUSEWHEEL:
+                self.zoom(event.y, *pg.mouse.get_pos())
+            elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1 and self.timeline.collidepoint(*event.pos):
+                self.scrubbing = True
+                self.scrub(event.pos[0])
+            elif event.type == pg.MOUSEMOTION and self.scrubbing:
+                self.scrub(event.pos[0])
+
+            if event.type == pg.MOUSEBUTTONUP and event.button == 1 and self.scrubbing:
+                self.scrubbing = False
+            elif event.type == pg.MOUSEBUTTONUP and event.button == 1:
                 button_pressed = False
                 for button in self.input_boxes:
                     # Make this input box active if it was clicked, else make it inactive if it was active
@@ -162,6 +258,9 @@ class Engine:
                                     speed_but.toggle()
                                     self.update_toggleable(speed_but)
                         break
+                else:
+                    # A click that missed every button toggles the wall of the cell under it
+                    self.edit(*event.pos)
             elif event.type == pg.KEYDOWN:
                 tab_pressed = False
                 for button in self.input_boxes:
@@ -183,6 +282,35 @@ class Engine:
                         self.update_toggleable(button)
                         tab_pressed = False
                         break
+                # Escape cancels a running solve or pauses a replay
+                if event.key == pg.K_ESCAPE:
+                    self.worker.cancel()
+                    self.playing = False
+                if any(button.is_active() for button in self.input_boxes):
+                    continue
+                # Arrow keys pan a quarter of the view at a time while no input box is taking keys
+                pans = {pg.K_UP: (-1, 0), pg.K_DOWN: (1, 0), pg.K_LEFT: (0, -1), pg.K_RIGHT: (0, 1)}
+                if event.key in pans:
+                    di, dj = pans[event.key]
+                    self.move_view(self.top + di * max((self.bottom - self.top) // 4, 1),
+                                   self.left + dj * max((self.right - self.left) // 4, 1))
+                # S shows or hides the stats overlay, P profiles the next solve, G picks the next generator, T turns
+                # terrain on or off for the next maze and L picks landmarks for the current maze
+                elif event.key == pg.K_s:
+                    self.toggle_stats()
+                elif event.key == pg.K_p:
+                    self.solver.profile = self.profile_path
+                elif event.key == pg.K_g:
+                    self.next_generator()
+                elif event.key == pg.K_t:
+                    self.toggle_terrain()
+                elif event.key == pg.K_l:
+                    self.preprocess()
+                # Home and End seek to either end of the log
+                elif event.key == pg.K_HOME:
+                    self.seek(0)
+                elif event.key == pg.K_END:
+                    self.seek(len(self.events.log))
                 # This allows tab to move from the last input box, to the first input box
                 if tab_pressed:
                     self.input_boxes[0].toggle()
@@ -190,11 +318,52 @@ class Engine:
             elif event.type == pg.VIDEOEXPOSE:
                 pg.display.flip()
 
+    # Starts solving the maze in the background, or replays the log of the last solve if it finished, pressing it
+    # again cancels the solve or pauses the replay
+    def solve(self):
+        if self.worker.running():
+            self.worker.cancel()
+            self.playing = False
+        elif self.playing and self.events.pending():
+            self.playing = False
+        elif self.events.log.complete:
+            # The solve was already recorded, so play it back instead of searching again
+            if not self.events.pending():
+                self.seek(0)
+            self.playing = True
+        else:
+            self.solver.clear_solution()
+            self.worker.start()
+            self.playing = True
+
+    # Replays the events the solver posted since the last frame, at most speed of them
+    def drain(self):
+        if not self.playing:
+            return
+        with self.stats.timer('render_seconds'):
+            if self.speed:
+                self.events.drain(self, self.speed)
+            else:
+                # Replay as much as fits in one frame so the window stays responsive however fast the solver is
+                deadline = perf_counter() + 1 / self.fps
+                self.events.drain(self, deadline=lambda: perf_counter() >= deadline)
+
     # Generates a new maze
     def new_maze(self):
+        self.worker.cancel()
+        self.events.clear()
+        self.stats.reset()
+        self.pick_solver()
+        # Tiled mazes are always generated as noise without terrain, one tile at a time
+        if isinstance(self.solver, Maze):
+            # A perfect maze too small to hold two rooms is built as noise instead
+            self.solver.set_generator(self.generator if fits(self.generator, self.rows, self.cols) else 'noise')
+            self.solver.terrain = self.terrain
+            # Only the dial and lpa modes and the repairs after wall edits count what crossing mud and water costs, and
+            # dial is the one that solves each new maze from scratch
+            self.solver.set_mode('dial' if self.terrain else 'best-first')
         self.solver.set_dimensions(self.rows, self.cols)
         self.maze = self.solver.build_maze()
-        self.squares = {}
         self.draw_maze()
 
     # Draw the text of a given element on the screen
@@ -207,35 +376,141 @@ class Engine:
         rect = text.get_rect(center=element.get_rect().center)
         self.display.blit(text, rect)
 
+    # Switches to the next generator in GENERATORS for the mazes built after it
+    def next_generator(self):
+        names = list(GENERATORS)
+        self.generator = names[(names.index(self.generator) + 1) % len(names)]
+        self.draw_caption()
+
+    # Turns mud and water on or off for the mazes built after it
+    def toggle_terrain(self):
+        self.terrain = 0.0 if self.terrain else 0.25
+        self.draw_caption()
+
+    # Says in the caption how the next maze will be built
+    def draw_caption(self):
+        pg.display.set_caption(f'Seeker of Paths - {self.generator}' + (' with terrain' if self.terrain else ''))
+
+    # Picks landmarks for the maze on display, the next solve is guided by them and searches again instead of
+    # replaying the log
+    def preprocess(self):
+        if self.maze is None or isinstance(self.solver, TiledMaze) or self.worker.running():
+            return
+        self.solver.preprocess()
+        self.events.clear()
+        self.playing = False
+
+    # Picks the solver for the size of maze asked for, a maze too large to show at one pixel per cell is stored in
+    # tiles that are only generated once they are solved through or scrolled into view
+    def pick_solver(self):
+        tiled = self.rows > self.safe_height or self.cols > self.safe_width
+        if tiled != isinstance(self.solver, TiledMaze):
+            self.solver = TiledMaze(self.rows, self.cols, self.events, stats=self.stats) if tiled else \
+                Maze(self.rows, self.cols, self.events, stats=self.stats)
+            self.worker.maze = self.solver
+
     # Displays the maze on the screen
     def draw_maze(self):
+        self.worker.cancel()
         self.solver.clear_solution()
-        # Clear any previously drawn mazes from the maze area
-        rect = pg.Rect(25, 25, self.safe_width, self.safe_height)
-        self.update(El.Element(rect, self.colors['wall']))
-        cell_size = floor(min(self.safe_height / self.rows, self.safe_width / self.cols))
-        y = 25
-        for i in range(self.rows):
-            x = 25
-            for j in range(self.cols):
-                rect = pg.Rect(x, y, cell_size, cell_size)
-                if isinstance(self.maze[i][j], int):
-                    color = self.colors['wall'] if self.maze[i][j] else self.colors['clear']
-                else:
-                    color = self.colors['start'] if self.maze[i][j] == 'S' else self.colors['end']
-                self.display.fill(color, rect)
-                self.squares[(i, j)] = El.Square(rect, color, i, j)
-                x += cell_size
-            y += cell_size
-        pg.display.flip()
+        # A finished log is kept, ready to be replayed from the start
+        self.events.position = 0
+        self.playing = False
+        self.shown = []
+        self.palette[CLEAR] = self.colors['clear']
+        self.palette[WALL] = self.colors['wall']
+        self.palette[MUD] = self.colors['mud']
+        self.palette[WATER] = self.colors['water']
+        for name, code in self.shades.items():
+            self.palette[code] = self.colors[name]
+        self.marks = Tiles(self.solver.height, self.solver.width)
+        self.marks[self.solver.start] = self.shades['start']
+        self.marks[self.solver.end] = self.shades['end']
+        # Fit the whole maze in view if it can be, else zoom in around the start
+        self.cell_size = floor(min(self.safe_height / self.solver.height, self.safe_width / self.solver.width))
+        if self.cell_size:
+            self.set_view(0, 0)
+        else:
+            self.cell_size = 4
+            self.set_view(self.solver.start[0] - self.safe_height // 8, self.solver.start[1] - self.safe_width // 8)
+        self.draw_view()
+        with self.stats.timer('render_seconds'):
+            pg.display.flip()
+
+    # Draws the cells in view, reading only the tiles of the maze and of the marks that overlap the view
+    def draw_view(self):
+        with self.stats.timer('render_seconds'):
+            # Clear any previously drawn mazes from the maze area
+            rect = pg.Rect(25, 25, self.safe_width, self.safe_height)
+            self.display.fill(self.colors['wall'], rect)
+            cells = self.maze[self.top:self.bottom, self.left:self.right]
+            marks = self.marks[self.top:self.bottom, self.left:self.right]
+            # Look up every cell's color at once, indexing the palette by the cell's mark or else its cell code
+            self.buffer = self.palette[np.where(marks, marks, cells)]
+            self.blit_buffer()
+            pg.display.update(rect)
+
+    # Moves the view, keeping it inside the maze
+    # @ param  top - row of the first cell to show
+    # @ param left - column of the first cell to show
+    def set_view(self, top, left):
+        rows = min(self.solver.height, self.safe_height // self.cell_size)
+        cols = min(self.solver.width, self.safe_width // self.cell_size)
+        self.top = min(max(top, 0), self.solver.height - rows)
+        self.left = min(max(left, 0), self.solver.width - cols)
+        self.bottom = self.top + rows
+        self.right = self.left + cols
+
+    # Pans the view and redraws it if it moved
+    # @ param  top - row of the first cell to show
+    # @ param left - column of the first cell to show
+    def move_view(self, top, left):
+        if self.maze is None:
+            return
+        view = self.top, self.left, self.bottom, self.right
+        self.set_view(top, left)
+        if view != (self.top, self.left, self.bottom, self.right):
+            self.draw_view()
+
+    # Doubles or halves the size of each cell, keeping the cell under the mouse in place
+    # @ param steps - positive to zoom in, negative to zoom out
+    # @ param     x - x value of the mouse position
+    # @ param     y - y value of the mouse position
+    def zoom(self, steps, x, y):
+        if self.maze is None or not steps or not (25 <= x < 25 + self.safe_width and 25 <= y < 25 + self.safe_height):
+            return
+        # A maze that fits on the screen can't be zoomed out past fitting it
+        smallest = max(floor(min(self.safe_height / self.solver.height, self.safe_width / self.solver.width)), 1)
+        size = min(max(self.cell_size * 2 if steps > 0 else self.cell_size // 2, smallest), self.max_zoom)
+        if size == self.cell_size:
+            return
+        i = self.top + (y - 25) // self.cell_size
+        j = self.left + (x - 25) // self.cell_size
+        self.cell_size = size
+        self.set_view(i - (y - 25) // size, j - (x - 25) // size)
+        self.draw_view()
+
+    # Draws the whole color buffer onto the maze area, scaling each cell up to its size in pixels
+    def blit_buffer(self):
+        rows, cols = self.buffer.shape[:2]
+        # Surfaces are indexed by x then y, so the buffer's rows and columns are swapped
+        surface = pg.surfarray.make_surface(self.buffer.swapaxes(0, 1))
+        surface = pg.transform.scale(surface, (cols * self.cell_size, rows * self.cell_size))
+        self.display.blit(surface, (25, 25))
+
+    # Gets the area of the display covered by a cell of the maze
+    # @  param i - ordinal row value of the cell
+    # @  param j - ordinal column value of the cell
+    # @ return   - pygame Rect object
+    def cell_rect(self, i, j):
+        return pg.Rect(25 + (j - self.left) * self.cell_size, 25 + (i - self.top) * self.cell_size, self.cell_size,
+                       self.cell_size)
 
     # Updates the display color of all cells contained in the solution
     # @ param solution - list of tuples containing the coordinate pairs of all cells from the solution
     def draw_solution(self, solution):
-        for position in solution:
-            square = self.squares[position]
-            square.set_color(self.colors['solution'])
-            self.update(square)
+        for i, j in solution:
+            self.update_square(i, j, 'solution')
 
     # Updates an element on the display
     # @ param element - Element object to be updated
@@ -253,14 +528,151 @@ class Engine:
         self.draw_font(element, color=color)
         self.update(element, fill=False)
 
-    # Updates a Square object on the display
-    # @ param i - ordinal row value of the square
-    # @ param j - ordinal column value of the square
-    def update_square(self, i, j):
-        square = self.squares[(i, j)]
-        square.set_color(self.colors['path'])
-        self.update(square)
-        sleep(self.sleep)
+    # Recolors a cell of the maze on the display
+    # @ param     i - ordinal row value of the cell
+    # @ param     j - ordinal column value of the cell
+    # @ param color - name of the color to turn the cell
+    def update_square(self, i, j, color='path'):
+        self.marks[i, j] = self.shades[color]
+        # Cells out of view are drawn from their marks once they're scrolled into view
+        if not (self.top <= i < self.bottom and self.left <= j < self.right):
+            return
+        self.buffer[i - self.top, j - self.left] = self.colors[color]
+        rect = self.cell_rect(i, j)
+        self.display.fill(self.colors[color], rect)
+        # Only mark the cell dirty, it reaches the screen with the rest of its frame
+        self.dirty.append(rect)
+
+    # Redraws a cell from its mark, or from its cell code if the solver hasn't colored it
+    # @ param i - ordinal row value of the cell
+    # @ param j - ordinal column value of the cell
+    def repaint(self, i, j):
+        if not (self.top <= i < self.bottom and self.left <= j < self.right):
+            return
+        color = self.palette[self.marks[i, j] or self.maze[i, j]]
+        self.buffer[i - self.top, j - self.left] = color
+        rect = self.cell_rect(i, j)
+        self.display.fill(color.tolist(), rect)
+        self.dirty.append(rect)
+
+    # Toggles the wall of the cell under the mouse, then repairs the solution on display around the edit
+    # @ param x - x value of the mouse position
+    # @ param y - y value of the mouse position
+    def edit(self, x, y):
+        # Tiled mazes can't be edited, and a solve that's running or being replayed would be drawn over
+        if self.maze is None or isinstance(self.solver, TiledMaze) or self.worker.running() or self.playing and \
+                self.events.pending():
+            return
+        if not (25 <= x < 25 + self.safe_width and 25 <= y < 25 + self.safe_height):
+            return
+        i = self.top + (y - 25) // self.cell_size
+        j = self.left + (x - 25) // self.cell_size
+        if not (i < self.bottom and j < self.right) or (i, j) in (self.solver.start, self.solver.end):
+            return
+        self.solver.toggle_wall(i, j)
+        # The log was recorded on the old walls, so it can't be replayed any more
+        self.events.clear()
+        self.playing = False
+        self.marks[i, j] = 0
+        self.repaint(i, j)
+        if not self.shown and self.solver.planner is None:
+            return
+        self.solver.repair()
+        # Only the cells that left or joined the solution are redrawn
+        kept = set(self.solver.solution)
+        for cell in self.shown:
+            if cell not in kept:
+                self.marks[cell] = 0
+                self.repaint(*cell)
+        for cell in kept.difference(self.shown):
+            self.update_square(*cell, 'solution')
+        self.shown = self.solver.solution
+
+    # Jumps the replay to any step of the log, redrawing the cells explored up to that step all at once
+    # @ param step - number of steps of the log to show, from 0 up to its length
+    def seek(self, step):
+        # The log is still growing while the solver runs
+        if self.maze is None or self.worker.running():
+            return
+        log = self.events.log
+        step = min(max(step, 0), len(log))
+        explored = min(step, len(log.backward))
+        self.marks = Tiles(self.solver.height, self.solver.width)
+        if explored:
+            backward = np.frombuffer(log.backward, dtype=np.uint8, count=explored)
+            self.marks.put(np.frombuffer(log.rows, dtype=np.int32, count=explored),
+                           np.frombuffer(log.cols, dtype=np.int32, count=explored),
+                           np.where(backward, self.shades['reverse'], self.shades['path']))
+        self.shown = []
+        if step > explored:
+            self.marks.put(log.solution_rows, log.solution_cols, self.shades['solution'])
+            self.shown = list(zip(log.solution_rows, log.solution_cols))
+        self.marks[self.solver.start] = self.shades['start']
+        self.marks[self.solver.end] = self.shades['end']
+        self.events.position = step
+        self.draw_view()
+
+    # Seeks to the step of the log under a point on the timeline
+    # @ param x - x value of the mouse position
+    def scrub(self, x):
+        self.seek(round((x - self.timeline.left) / self.timeline.width * len(self.events.log)))
+
+    # Draws how far the replay has got through the log as a bar under the maze
+    def draw_timeline(self):
+        position, length = self.progress = self.events.position, len(self.events.log)
+        self.display.fill(self.colors['light_bg'], self.timeline)
+        if length:
+            done = self.timeline.copy()
+            done.width = round(done.width * position / length)
+            self.display.fill(self.colors['path'], done)
+        self.dirty.append(self.timeline)
+
+    # Pushes every dirty Rect to the screen in one call, then waits out the rest of the frame
+    def present(self):
+        # Redraw the stats a few times a second, any faster and they can't be read anyway
+        if self.show_stats and perf_counter() - self.stats_drawn >= 0.25:
+            self.draw_stats()
+        if self.progress != (self.events.position, len(self.events.log)):
+            self.draw_timeline()
+        if self.dirty:
+            with self.stats.timer('render_seconds'):
+                pg.display.update(self.dirty)
+            self.dirty = []
+            self.stats.frames += 1
+        with self.stats.timer('idle_seconds'):
+            self.clock.tick(self.fps)
+
+    # Draws the stats overlay in the side panel
+    def draw_stats(self):
+        self.display.fill(self.colors['line'], self.stats_rect)
+        top = self.stats_rect.top
+        for line in self.stats.lines():
+            self.display.blit(self.small_font.render(line, True, self.colors['text']), (self.stats_rect.left, top))
+            top += self.small_font.get_linesize()
+        self.dirty.append(self.stats_rect)
+        self.stats_drawn = perf_counter()
+
+    # Shows or hides the stats overlay
+    def toggle_stats(self):
+        self.show_stats = not self.show_stats
+        if self.show_stats:
+            self.draw_stats()
+        else:
+            self.display.fill(self.colors['line'], self.stats_rect)
+            self.dirty.append(self.stats_rect)
+
+    # Turns a newly explored cell blue, or purple if it was reached searching back from the end
+    # @ param        i - ordinal row value of the square
+    # @ param        j - ordinal column value of the square
+    # @ param backward - True if the cell was reached by a search running from the end back to the start
+    def explore(self, i, j, backward=False):
+        self.update_square(i, j, 'reverse' if backward else 'path')
+
+    # Turns every cell of a found solution gold
+    # @ param solution - list of tuples containing the coordinate pairs of all cells from the solution
+    def solved(self, solution):
+        self.draw_solution(solution)
+        self.shown = solution
 
     # Updates number of rows in the maze
     # @ param rows - number of desired rows
@@ -272,10 +684,10 @@ class Engine:
     def set_cols(self, cols):
         self.cols = cols
 
-    # Set the delay time between updating squares
-    # @ param time - number of seconds to set the delay to
-    def set_sleep(self, time):
-        self.sleep = time
+    # Set the number of squares updated on each frame
+    # @ param speed - number of squares, 0 to update as many as the solver allows
+    def set_speed(self, speed):
+        self.speed = speed
 
 
 def quit_screen():
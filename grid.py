@@ -0,0 +1,108 @@
+from heapq import heappop, heappush
+from itertools import count
+import numpy as np
+
+# Integer codes stored in each cell of a maze grid, mud and water are terrain crossed at a higher cost than clear cells
+CLEAR = 0
+WALL = 1
+MUD = 2
+WATER = 3
+# Cost of moving onto a cell, indexed by its code, walls can't be moved onto and cost 0
+COSTS = np.array([1, 0, 3, 5], dtype=np.uint8)
+
+
+# Builds a grid of randomly placed walls in a single vectorized draw
+# @  param     rng - numpy Generator object used to place the walls
+# @  param  height - number of rows in the grid
+# @  param   width - number of columns in the grid
+# @  param density - chance of each cell being a wall
+# @ return    grid - 2D uint8 array of cell codes
+def random_grid(rng, height, width, density=1 / 3):
+    return (rng.random((height, width)) < density).astype(np.uint8)
+
+
+# Turns some of the clear cells of a grid into mud or water, in place, leaving the walls and so the regions as they are
+# @ param    rng - numpy Generator object used to place the terrain
+# @ param   grid - 2D array of cell codes
+# @ param chance - chance of each clear cell becoming mud or water, split evenly between the two
+def add_terrain(rng, grid, chance):
+    rough = (grid == CLEAR) & (rng.random(grid.shape) < chance)
+    grid[rough] = np.where(rng.random(np.count_nonzero(rough)) < 0.5, MUD, WATER)
+
+
+# Labels the connected regions of clear cells, merging neighbouring cells with a vectorized union-find that hooks
+# the larger of two roots onto the smaller and then compresses every path in one pass
+# @  param   grid - 2D array of cell codes
+# @ return labels - 2D int32 array holding the smallest flat index in each cell's region, -1 for walls
+def label_components(grid):
+    height, width = grid.shape
+    clear = (grid != WALL).reshape(-1)
+    index = np.arange(height * width, dtype=np.int32).reshape(height, width)
+    # Every pair of clear cells next to each other, first horizontally and then vertically
+    pairs = [(index[:, :-1], index[:, 1:]), (index[:-1, :], index[1:, :])]
+    first = np.concatenate([a.reshape(-1) for a, _ in pairs])
+    second = np.concatenate([b.reshape(-1) for _, b in pairs])
+    joined = clear[first] & clear[second]
+    first, second = first[joined], second[joined]
+    parent = index.reshape(-1).copy()
+    while True:
+        # Each cell points straight at its root after compressing, so these are the roots of both cells
+        a, b = parent[first], parent[second]
+        split = a != b
+        if not split.any():
+            break
+        first, second, a, b = first[split], second[split], a[split], b[split]
+        np.minimum.at(parent, np.maximum(a, b), np.minimum(a, b))
+        # Pointer jumping until every cell points straight at its root
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+    parent[~clear] = -1
+    return parent.reshape(height, width)
+
+
+# Runs A* over any graph whose moves cost a non-negative amount, keeping every node it reaches in dictionaries so the
+# nodes can be cells, jump points or graph nodes alike
+#
+# Ties on the estimated total are broken towards the longest path so far, which dives straight at the end instead of
+# widening across every equally good node.
+# @  param      start - node the search starts from
+# @  param        end - node the search is looking for
+# @  param successors - function called with a node and the node it was reached from, None for the start, generating
+#                       a (node, cost) tuple for each neighbour and the cost of moving onto it
+# @  param   estimate - function called with a node, bounding the cost of the rest of the path from it from below
+# @  param      visit - function called with each node pushed other than the end, None to skip
+# @ return            - tuple containing the list of nodes from the start up to the end, None if unreachable, then
+#                       the number of nodes expanded and the largest number of entries on the open list at once
+def astar(start, end, successors, estimate, visit=None):
+    order = count()
+    cost = {start: 0}
+    parent = {start: None}
+    expanded = 0
+    peak = 1
+    frontier = [(estimate(start), 0, next(order), start)]
+    while frontier:
+        _, depth, _, node = heappop(frontier)
+        # Skip entries made stale by a cheaper path found after they were pushed
+        if -depth > cost[node]:
+            continue
+        if node == end:
+            route = []
+            while node is not None:
+                route.append(node)
+                node = parent[node]
+            route.reverse()
+            return route, expanded, peak
+        expanded += 1
+        for other, step in successors(node, parent[node]):
+            new_cost = cost[node] + step
+            if new_cost < cost.get(other, new_cost + 1):
+                cost[other] = new_cost
+                parent[other] = node
+                heappush(frontier, (new_cost + estimate(other), -new_cost, next(order), other))
+                if visit and other != end:
+                    visit(other)
+        peak = max(peak, len(frontier))
+    return None, expanded, peak
@@ -0,0 +1,215 @@
+import numpy as np
+from grid import WALL, astar
+from wavefront import distance_field, shifted_masks, spread, walk_back
+
+# Width and height in cells of each cluster
+CLUSTER = 16
+
+
+# Abstract graph of a grid for hierarchical path finding
+#
+# The grid is cut into square clusters. Wherever clear cells line up across the border of two clusters, the run of
+# them is joined by a transition: one pair of cells in the middle of a short run, or one at each end of a long run.
+# Those cells become the nodes of the graph, joined across the border at a cost of 1 and to every other node of their
+# own cluster at the length of the shortest path between them inside the cluster. A path is found by searching that
+# graph, then only the clusters along the route are searched cell by cell.
+class ClusterGraph:
+
+    # @ param       grid - 2D array of cell codes
+    # @ param       size - width and height in cells of each cluster
+    # @  attr      width - number of columns in the grid
+    # @  attr      nodes - dictionary mapping each cluster's row and column to a list of the flat indexes of its nodes
+    # @  attr      edges - dictionary mapping each node to a list of (node, cost) tuples
+    # @  attr     routes - dictionary mapping (node, node) tuples to the cells between them, filled in as they're used
+    # @  attr   expanded - number of nodes expanded by the last search
+    # @  attr       peak - largest number of entries on the open list at once during the last search
+    # @  attr heuristics - number of heuristic estimates made by the last search
+    def __init__(self, grid, size=CLUSTER):
+        self.grid = grid
+        self.size = size
+        self.height, self.width = grid.shape
+        self.nodes = {}
+        self.edges = {}
+        self.routes = {}
+        self.expanded = 0
+        self.peak = 0
+        self.heuristics = 0
+        self.link_borders()
+        self.link_clusters()
+
+    # Gets the cluster a cell belongs to
+    # @  param cell - flat index of the cell
+    # @ return      - tuple containing the row and column of the cluster
+    def cluster(self, cell):
+        i, j = divmod(cell, self.width)
+        return i // self.size, j // self.size
+
+    # Adds a node to the graph, unless it's already there
+    # @ param cell - flat index of the cell
+    def add_node(self, cell):
+        if cell not in self.edges:
+            self.edges[cell] = []
+            self.nodes.setdefault(self.cluster(cell), []).append(cell)
+
+    # Places the transitions across every border between two clusters
+    def link_borders(self):
+        clear = self.grid != WALL
+        # Columns on the left of each vertical border, then rows above each horizontal border
+        for axis, length in ((1, self.width), (0, self.height)):
+            for line in range(self.size - 1, length - 1, self.size):
+                if axis:
+                    crossings = clear[:, line] & clear[:, line + 1]
+                else:
+                    crossings = clear[line, :] & clear[line + 1, :]
+                for along in transitions(crossings, self.size):
+                    a, b = ((along, line), (along, line + 1)) if axis else ((line, along), (line + 1, along))
+                    a, b = a[0] * self.width + a[1], b[0] * self.width + b[1]
+                    self.add_node(a)
+                    self.add_node(b)
+                    self.edges[a].append((b, 1))
+                    self.edges[b].append((a, 1))
+
+    # Joins the nodes of each cluster by the lengths of the shortest paths between them inside the cluster
+    #
+    # Moves across cluster borders are masked out, so a breadth first search from one node of every cluster can run
+    # at once without the searches ever meeting. Each pass fills in the edges of one more node of every cluster.
+    def link_clusters(self):
+        rows, cols = np.indices((self.height, self.width)) % self.size
+        # Drop every move leaving a cluster, shifted_masks orders the moves east, south, west and north
+        keeps = (cols != self.size - 1, rows != self.size - 1, cols != 0, rows != 0)
+        moves = shifted_masks(self.grid)
+        for (mask, _), keep in zip(moves, keeps):
+            mask &= keep.reshape(-1)
+        clusters = list(self.nodes.values())
+        for k in range(max(map(len, clusters), default=0)):
+            sources = [nodes[k] for nodes in clusters if len(nodes) > k]
+            dist = np.full(self.height * self.width, -1, dtype=np.int32)
+            spread(dist, np.array(sources), moves)
+            for nodes in clusters:
+                if len(nodes) <= k:
+                    continue
+                source = nodes[k]
+                for node, cost in zip(nodes[k + 1:], dist[nodes[k + 1:]].tolist()):
+                    if cost > 0:
+                        self.edges[source].append((node, cost))
+                        self.edges[node].append((source, cost))
+
+    # Gets a cluster's cells and the position of its top left cell
+    # @  param   cluster - tuple containing the row and column of the cluster
+    # @ return           - tuple containing the 2D array of the cluster's cells, and its top and left
+    def block(self, cluster):
+        top, left = cluster[0] * self.size, cluster[1] * self.size
+        return self.grid[top:top + self.size, left:left + self.size], top, left
+
+    # Finds the lengths of the paths from a cell to every node of its cluster, staying inside the cluster
+    # @  param  cell - flat index of the cell
+    # @ return links - list of (node, cost) tuples for the nodes the cell can reach
+    def local_links(self, cell):
+        cluster = self.cluster(cell)
+        block, top, left = self.block(cluster)
+        i, j = divmod(cell, self.width)
+        field = distance_field(block, (i - top, j - left))
+        links = []
+        for node in self.nodes.get(cluster, []):
+            row, col = divmod(node, self.width)
+            cost = int(field[row - top, col - left])
+            if cost >= 0:
+                links.append((node, cost))
+        return links
+
+    # Finds a path between two cells, searching the abstract graph and then refining the route it takes
+    # @  param start - coordinate pair the path leaves from
+    # @  param   end - coordinate pair the path arrives at
+    # @  param visit - function called with the coordinates of each node pushed, None to skip
+    # @ return  path - list of coordinate pairs from the cell after the start up to the end, None if unreachable
+    def path(self, start, end, visit=None):
+        start = start[0] * self.width + start[1]
+        end = end[0] * self.width + end[1]
+        # The start and end only join the graph for this search, through the nodes of their own clusters
+        first = self.local_links(start)
+        last = {node: cost for node, cost in self.local_links(end)}
+        if self.cluster(start) == self.cluster(end):
+            # The direct route inside the cluster may be shorter than any route through its nodes
+            block, top, left = self.block(self.cluster(start))
+            (si, sj), (ei, ej) = divmod(start, self.width), divmod(end, self.width)
+            cost = int(distance_field(block, (si - top, sj - left))[ei - top, ej - left])
+            if cost >= 0:
+                first.append((end, cost))
+        route = self.search(start, end, first, last, visit)
+        if route is None:
+            return None
+        path = []
+        for a, b in zip(route, route[1:]):
+            path.extend(self.refine(a, b))
+        return [divmod(cell, self.width) for cell in path]
+
+    # Runs A* over the abstract graph using the Manhattan distance to the end as the heuristic
+    # @  param start - flat index of the start
+    # @  param   end - flat index of the end
+    # @  param first - list of (node, cost) tuples linking the start into the graph
+    # @  param  last - dictionary mapping each node linked to the end to its cost
+    # @  param visit - function called with the coordinates of each node pushed, None to skip
+    # @ return route - list of the flat indexes of the nodes on the route from the start to the end, None if there
+    #                  isn't one
+    def search(self, start, end, first, last, visit=None):
+        ei, ej = divmod(end, self.width)
+
+        # Estimates the length of the rest of the path from a node
+        def estimate(node):
+            self.heuristics += 1
+            i, j = divmod(node, self.width)
+            return abs(i - ei) + abs(j - ej)
+
+        # The start and end only have the links made for this search on top of the graph's own edges
+        def successors(node, parent):
+            links = self.edges.get(node, [])
+            if node == start:
+                links = links + first
+            if node in last:
+                links = links + [(end, last[node])]
+            return links
+
+        self.heuristics = 0
+        route, self.expanded, self.peak = astar(start, end, successors, estimate,
+                                                visit and (lambda node: visit(*divmod(node, self.width))))
+        return route
+
+    # Finds the cells joining two consecutive nodes of a route, searching only the cluster they share
+    # @  param    a - flat index of the node the step leaves from
+    # @  param    b - flat index of the node the step arrives at
+    # @ return path - list of flat indexes from the cell after a up to b
+    def refine(self, a, b):
+        path = self.routes.get((a, b))
+        if path is not None:
+            return path
+        ai, aj = divmod(a, self.width)
+        bi, bj = divmod(b, self.width)
+        if abs(ai - bi) + abs(aj - bj) == 1:
+            path = [b]
+        else:
+            block, top, left = self.block(self.cluster(a))
+            target = bi - top, bj - left
+            cells = walk_back(distance_field(block, (ai - top, aj - left), target), target)
+            path = [(i + top) * self.width + j + left for i, j in cells]
+        # Only routes between nodes are kept, the start and end change with every query
+        if a in self.edges and b in self.edges:
+            self.routes[a, b] = path
+        return path
+
+
+# Picks where transitions cross one border, splitting the border into the stretches each pair of clusters share
+# @  param crossings - 1D boolean array flagging each place along the border where both sides are clear
+# @  param      size - width and height in cells of each cluster
+# @ return    places - list of the positions along the border to place a transition at
+def transitions(crossings, size):
+    places = []
+    for begin in range(0, crossings.size, size):
+        stretch = np.concatenate(([False], crossings[begin:begin + size], [False]))
+        edges = np.flatnonzero(stretch[1:] != stretch[:-1]).tolist()
+        for low, high in zip(edges[::2], edges[1::2]):
+            # A short run only needs one transition in its middle, a long run gets one at each end
+            if high - low < 6:
+                places.append(begin + (low + high - 1) // 2)
+            else:
+                places.extend((begin + low, begin + high - 1))
+    return places
@@ -0,0 +1,182 @@
+import numpy as np
+from grid import WALL, astar
+
+
+# Jump Point Search for 4-connected grids where every move costs the same
+#
+# Paths are kept in a canonical form where a path moving horizontally only turns vertical once a wall stops it from
+# having turned one cell earlier, while a path moving vertically may turn horizontally anywhere. A horizontal scan
+# therefore stops at cells with a forced vertical neighbour, and a vertical scan stops at any cell a horizontal scan
+# would stop from. Only those jump points are pushed onto the open list, so long runs of clear cells cost a single
+# expansion instead of one per cell.
+class JumpPointSearch:
+
+    # @ param       grid - 2D array of cell codes
+    # @ param      start - coordinate pair the search starts from
+    # @ param        end - coordinate pair the search is looking for
+    # @ param      visit - function called with the coordinates of each jump point pushed, None to skip
+    # @ param     tables - JumpTables object built from the grid, None to build one
+    # @  attr   expanded - number of jump points expanded
+    # @  attr       peak - largest number of entries on the open list at once
+    # @  attr heuristics - number of heuristic estimates made
+    def __init__(self, grid, start, end, visit=None, tables=None):
+        self.height, self.width = grid.shape
+        self.tables = tables if tables else JumpTables(grid)
+        self.start = start
+        self.end = end
+        self.visit = visit
+        self.expanded = 0
+        self.peak = 1
+        self.heuristics = 0
+
+    # Determines if a cell is on the grid and clear
+    # @  param    i - row value of the cell
+    # @  param    j - col value of the cell
+    # @ return True - if the cell can be moved onto
+    def clear(self, i, j):
+        return 0 <= i < self.height and 0 <= j < self.width and self.tables.cells[i * self.width + j] != WALL
+
+    # Scans horizontally until reaching a jump point
+    # @  param    i - row value of the cell the scan starts from
+    # @  param    j - col value of the cell the scan starts from
+    # @  param   dj - direction of the scan, 1 for east or -1 for west
+    # @ return      - coordinate pair of the jump point, None if the scan hits a wall first
+    def jump_horizontal(self, i, j, dj):
+        stops = self.tables.east if dj > 0 else self.tables.west
+        k = stops[i * self.width + j]
+        # The end is a jump point wherever it lies, so check if the scan passes it before stopping
+        if i == self.end[0] and 0 < (self.end[1] - j) * dj <= (k - j) * dj:
+            return self.end
+        return (i, k) if self.clear(i, k) else None
+
+    # Scans vertically until reaching a jump point
+    # @  param    i - row value of the cell the scan starts from
+    # @  param    j - col value of the cell the scan starts from
+    # @  param   di - direction of the scan, 1 for south or -1 for north
+    # @ return      - coordinate pair of the jump point, None if the scan hits a wall first
+    def jump_vertical(self, i, j, di):
+        stops = self.tables.south if di > 0 else self.tables.north
+        k = stops[i * self.width + j]
+        row = self.end[0]
+        # A scan passing the row of the end stops there if it can see the end, every cell it passes is clear since
+        # it only stops early on a wall or a precomputed stop
+        if 0 < (row - i) * di < (k - i) * di:
+            if j == self.end[1] or self.jump_horizontal(row, j, 1) == self.end or \
+                    self.jump_horizontal(row, j, -1) == self.end:
+                return row, j
+        return (k, j) if self.clear(k, j) else None
+
+    # Generates the jump points reachable from a jump point without breaking the canonical form
+    # @  param   node - coordinate pair of the jump point being expanded
+    # @  param parent - coordinate pair of the jump point it was reached from, None for the start
+    # @ yield         - tuple containing the coordinate pair of each jump point found and its distance from the node
+    def successors(self, node, parent):
+        i, j = node
+        if parent is None:
+            # The start has no direction of travel, so every direction is natural
+            scans = ((self.jump_horizontal, 1), (self.jump_vertical, 1), (self.jump_horizontal, -1),
+                     (self.jump_vertical, -1))
+        elif parent[0] == i:
+            dj = 1 if j > parent[1] else -1
+            scans = [(self.jump_horizontal, dj)]
+            scans.extend((self.jump_vertical, di) for di in (1, -1)
+                         if self.clear(i + di, j) and not self.clear(i + di, j - dj))
+        else:
+            di = 1 if i > parent[0] else -1
+            scans = ((self.jump_horizontal, 1), (self.jump_vertical, di), (self.jump_horizontal, -1))
+        for jump, direction in scans:
+            point = jump(i, j, direction)
+            if point:
+                yield point, manhattan(node, point)
+
+    # Runs A* over the jump points using the Manhattan distance to the end as the heuristic
+    # @ return path - list of coordinate pairs from the cell after the start up to the end, None if unreachable
+    def search(self):
+
+        # Estimates the length of the rest of the path from a jump point
+        def estimate(node):
+            self.heuristics += 1
+            return manhattan(node, self.end)
+
+        route, self.expanded, self.peak = astar(self.start, self.end, self.successors, estimate,
+                                                self.visit and (lambda node: self.visit(*node)))
+        return None if route is None else self.path(route)
+
+    # Fills in the straight runs between the jump points of a route
+    # @  param route - list of the jump points from the start to the end
+    # @ return  path - list of coordinate pairs from the cell after the start up to the end
+    def path(self, route):
+        path = []
+        for parent, node in zip(route, route[1:]):
+            di = (node[0] > parent[0]) - (node[0] < parent[0])
+            dj = (node[1] > parent[1]) - (node[1] < parent[1])
+            i, j = parent
+            while (i, j) != node:
+                i, j = i + di, j + dj
+                path.append((i, j))
+        return path
+
+
+# Precomputed jump distances for a grid, so every scan of a JumpPointSearch takes constant time
+#
+# A horizontal scan stops at the first wall or cell with a forced vertical neighbour, and a vertical scan stops at
+# the first wall or cell a horizontal scan would stop from. Neither depends on where the search starts or ends, so
+# the tables can be shared between every search on the same grid. The end of a search is checked separately.
+class JumpTables:
+
+    # @ param  grid - 2D array of cell codes
+    # @ attr  cells - flat view of the grid indexed by row * width + col
+    # @ attr   east - flat view holding the column each scan to the east stops at, the width if it leaves the grid
+    # @ attr   west - flat view holding the column each scan to the west stops at, -1 if it leaves the grid
+    # @ attr  south - flat view holding the row each scan to the south stops at, the height if it leaves the grid
+    # @ attr  north - flat view holding the row each scan to the north stops at, -1 if it leaves the grid
+    def __init__(self, grid):
+        height, width = grid.shape
+        self.cells = memoryview(np.ascontiguousarray(grid).reshape(-1))
+        # Pad the grid with walls so every neighbour lookup stays in bounds
+        clear = np.zeros((height + 2, width + 2), dtype=bool)
+        clear[1:-1, 1:-1] = grid != WALL
+        up, down = clear[:-2, 1:-1], clear[2:, 1:-1]
+        wall = ~clear[1:-1, 1:-1]
+        # Moving east into a cell, its vertical neighbour is forced if the neighbour's west side is a wall
+        forced_east = (up & ~clear[:-2, :-2]) | (down & ~clear[2:, :-2])
+        forced_west = (up & ~clear[:-2, 2:]) | (down & ~clear[2:, 2:])
+        east = next_stop(wall | forced_east, 1, 1)
+        west = next_stop(wall | forced_west, 1, -1)
+        # A horizontal scan hits something when it stops on a clear cell rather than a wall or the edge
+        rows = np.arange(height)[:, None]
+        hits = ((east < width) & ~wall[rows, np.minimum(east, width - 1)]) | \
+               ((west >= 0) & ~wall[rows, np.maximum(west, 0)])
+        south = next_stop(wall | hits, 0, 1)
+        north = next_stop(wall | hits, 0, -1)
+        self.east, self.west, self.south, self.north = (memoryview(np.ascontiguousarray(table).reshape(-1))
+                                                        for table in (east, west, south, north))
+
+
+# Finds the first stopping cell strictly past each cell along one axis
+# @  param  stops - 2D boolean array flagging the cells a scan stops at
+# @  param   axis - 0 to scan along columns, 1 to scan along rows
+# @  param   step - 1 to scan towards higher indexes, -1 towards lower indexes
+# @ return   next - 2D array holding the index of the next stopping cell, one past the edge if there isn't one
+def next_stop(stops, axis, step):
+    if axis == 0:
+        return next_stop(stops.T, 1, step).T
+    size = stops.shape[1]
+    result = np.full(stops.shape, size if step > 0 else -1, dtype=np.int32)
+    if step > 0:
+        # Running minimum from the far edge gives the nearest stop at or past each cell, shifting it by one cell
+        # keeps a scan from stopping on the cell it starts from
+        marks = np.where(stops, np.arange(size), size)
+        result[:, :-1] = np.minimum.accumulate(marks[:, ::-1], axis=1)[:, ::-1][:, 1:]
+    else:
+        marks = np.where(stops, np.arange(size), -1)
+        result[:, 1:] = np.maximum.accumulate(marks, axis=1)[:, :-1]
+    return result
+
+
+# Calculates the Manhattan distance between two coordinate pairs
+# @  param a - first coordinate pair
+# @  param b - second coordinate pair
+# @ return   - Manhattan distance
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -0,0 +1,97 @@
+import numpy as np
+from grid import WALL, astar, label_components
+from wavefront import distance_field
+
+# Number of landmarks picked unless asked for another number
+LANDMARKS = 8
+
+
+# Landmark distances for A* with the ALT heuristic on one grid
+#
+# A few landmark cells are spread as far apart as possible over the largest region, and the distance from each of
+# them to every cell is stored. For any landmark L, the triangle inequality bounds the distance between two cells a
+# and b from below by |d(L, a) - d(L, b)|, which unlike the Manhattan distance follows the walls. The distances only
+# depend on the walls, so one set of landmarks serves every query on the same grid.
+class Landmarks:
+
+    # @ param       grid - 2D array of cell codes
+    # @ param components - region labels of the grid, None to label it here
+    # @ param      count - number of landmarks to pick
+    # @  attr      cells - list of the flat indexes of the landmarks
+    # @  attr  distances - 2D array holding a row for each cell with its distance from every landmark, 0 for cells
+    #                      none of them can reach, stored in 16 bits unless a distance doesn't fit
+    # @  attr      table - flat view of the distances indexed by cell * count + landmark
+    # @  attr   expanded - number of cells expanded by the last search
+    # @  attr       peak - largest number of entries on the open list at once during the last search
+    # @  attr heuristics - number of heuristic estimates made by the last search
+    def __init__(self, grid, components=None, count=LANDMARKS):
+        self.grid = grid
+        self.height, self.width = grid.shape
+        self.count = count
+        self.cells = []
+        self.distances = np.zeros((grid.size, count), dtype=np.uint16)
+        self.pick(label_components(grid) if components is None else components)
+        self.table = memoryview(self.distances.reshape(-1))
+        self.expanded = 0
+        self.peak = 0
+        self.heuristics = 0
+
+    # Picks the landmarks one at a time, each on the cell furthest from every landmark picked before it, starting
+    # from the cell furthest from the root of the largest region
+    # @ param components - region labels of the grid
+    def pick(self, components):
+        labels = components.reshape(-1)
+        roots, sizes = np.unique(labels[labels >= 0], return_counts=True)
+        if not roots.size:
+            return
+        root = int(roots[np.argmax(sizes)])
+        field = distance_field(self.grid, divmod(root, self.width)).reshape(-1)
+        nearest = field
+        for k in range(self.count):
+            cell = int(np.argmax(nearest))
+            self.cells.append(cell)
+            field = distance_field(self.grid, divmod(cell, self.width)).reshape(-1)
+            # Only a region winding through more than 65535 cells needs the wider type
+            if field.max() > np.iinfo(self.distances.dtype).max:
+                self.distances = self.distances.astype(np.uint32)
+            self.distances[:, k] = np.maximum(field, 0)
+            # Cells outside the region are -1 in every field, so they are never picked
+            nearest = field if k == 0 else np.minimum(nearest, field)
+
+    # Bounds the distance between two cells from below with the landmark that best separates them
+    # @  param    a - flat index of the first cell
+    # @  param    b - flat index of the second cell
+    # @ return      - lower bound on the number of moves between the cells
+    def estimate(self, a, b):
+        self.heuristics += 1
+        k = self.count
+        return max((abs(x - y) for x, y in zip(self.table[a * k:a * k + k], self.table[b * k:b * k + k])), default=0)
+
+    # Runs A* between two cells using the larger of the landmark bound and the Manhattan distance as the heuristic
+    # @  param start - coordinate pair the path leaves from
+    # @  param   end - coordinate pair the path arrives at
+    # @  param visit - function called with the coordinates of each cell pushed, None to skip
+    # @ return  path - list of coordinate pairs from the cell after the start up to the end, None if unreachable
+    def search(self, start, end, visit=None):
+        cells = memoryview(self.grid.reshape(-1))
+        ei, ej = end
+        start = start[0] * self.width + start[1]
+        end = ei * self.width + ej
+
+        # Estimates the length of the rest of the path from a cell, both bounds are admissible so their maximum is
+        def estimate(cell):
+            i, j = divmod(cell, self.width)
+            return max(self.estimate(cell, end), abs(i - ei) + abs(j - ej))
+
+        # Every move costs the same, so a cell's neighbours are just the clear cells next to it
+        def successors(cell, parent):
+            i, j = divmod(cell, self.width)
+            for other, inside in ((cell + 1, j + 1 < self.width), (cell + self.width, i + 1 < self.height),
+                                  (cell - 1, j > 0), (cell - self.width, i > 0)):
+                if inside and cells[other] != WALL:
+                    yield other, 1
+
+        self.heuristics = 0
+        route, self.expanded, self.peak = astar(start, end, successors, estimate,
+                                                visit and (lambda cell: visit(*divmod(cell, self.width))))
+        return None if route is None else [divmod(cell, self.width) for cell in route[1:]]
@@ -0,0 +1,142 @@
+from array import array
+from heapq import heappop, heappush
+from grid import COSTS, WALL
+
+# Distance of a cell that can't be reached, small enough that adding a move to it still fits in an int32
+INF = 1 << 30
+
+
+# Lifelong Planning A* between two fixed cells of a grid whose walls can change, moving onto mud or water costs what
+# COSTS gives for it
+#
+# Each cell keeps g, its distance as of the last time it was expanded, and rhs, its distance as given by its
+# neighbours' current g values. Only cells where the two disagree are queued, so after a wall is toggled the search
+# only revisits the cells whose distance the edit actually changed, and keeps everything else from the searches
+# before it.
+class LifelongPlanner:
+
+    # @ param       grid - 2D array of cell codes, edited in place by the caller
+    # @ param      start - coordinate pair the paths leave from
+    # @ param        end - coordinate pair the paths arrive at
+    # @  attr          g - array holding the distance of each cell when it was last expanded, INF if never reached
+    # @  attr        rhs - array holding the distance of each cell given by its neighbours, INF if unreachable
+    # @  attr      queue - heap of (estimate, distance, cell) tuples waiting to be expanded, possibly stale
+    # @  attr     queued - dictionary mapping each queued cell to its current key, anything else on the heap is stale
+    # @  attr   expanded - number of cells expanded over every search so far
+    # @  attr       peak - largest number of cells queued at once
+    # @  attr heuristics - number of heuristic estimates made over every search so far
+    def __init__(self, grid, start, end):
+        self.height, self.width = grid.shape
+        self.cells = memoryview(grid.reshape(-1))
+        # Looked up by each cell's code as it is now, since the caller edits the grid in place
+        self.costs = COSTS.tolist()
+        self.start = start[0] * self.width + start[1]
+        self.end = end[0] * self.width + end[1]
+        self.g = array('i', [INF]) * (self.height * self.width)
+        self.rhs = array('i', [INF]) * (self.height * self.width)
+        self.rhs[self.start] = 0
+        self.queue = []
+        self.queued = {}
+        self.expanded = 0
+        self.peak = 1
+        self.heuristics = 0
+        self.push(self.start)
+
+    # Calculates the priority of a cell, the estimated length of a path through it and then its distance
+    # @  param cell - flat index of the cell
+    # @ return      - tuple containing the two parts of the key
+    def key(self, cell):
+        self.heuristics += 1
+        i, j = divmod(cell, self.width)
+        ei, ej = divmod(self.end, self.width)
+        dist = min(self.g[cell], self.rhs[cell])
+        return dist + abs(i - ei) + abs(j - ej), dist
+
+    # Queues a cell under its current key
+    # @ param cell - flat index of the cell
+    def push(self, cell):
+        key = self.key(cell)
+        self.queued[cell] = key
+        heappush(self.queue, (*key, cell))
+        self.peak = max(self.peak, len(self.queued))
+
+    # Generates the cells next to a cell, walls included
+    # @  param cell - flat index of the cell
+    # @ yield  cell - flat index of each neighbour on the grid
+    def neighbours(self, cell):
+        i, j = divmod(cell, self.width)
+        if j + 1 < self.width:
+            yield cell + 1
+        if i + 1 < self.height:
+            yield cell + self.width
+        if j > 0:
+            yield cell - 1
+        if i > 0:
+            yield cell - self.width
+
+    # Recalculates a cell's rhs from its neighbours and queues it if that leaves it inconsistent
+    # @ param cell - flat index of the cell
+    def update(self, cell):
+        if cell != self.start:
+            best = INF
+            if self.cells[cell] != WALL:
+                step = self.costs[self.cells[cell]]
+                for other in self.neighbours(cell):
+                    if self.cells[other] != WALL and self.g[other] + step < best:
+                        best = self.g[other] + step
+            self.rhs[cell] = best
+        self.queued.pop(cell, None)
+        if self.g[cell] != self.rhs[cell]:
+            self.push(cell)
+
+    # Tells the planner a cell of the grid was toggled between clear and wall
+    # @ param i - row value of the cell
+    # @ param j - col value of the cell
+    def edit(self, i, j):
+        cell = i * self.width + j
+        self.update(cell)
+        for other in self.neighbours(cell):
+            self.update(other)
+
+    # Expands inconsistent cells until the end's distance is settled
+    # @  param visit - function called with the coordinates of each cell expanded, None to skip
+    # @ return  True - if the end can be reached
+    def compute(self, visit=None):
+        while self.queue:
+            *key, cell = self.queue[0]
+            if self.queued.get(cell) != tuple(key):
+                # Stale entry left behind by a cell that was requeued or settled since it was pushed
+                heappop(self.queue)
+                continue
+            if tuple(key) >= self.key(self.end) and self.rhs[self.end] == self.g[self.end]:
+                break
+            heappop(self.queue)
+            del self.queued[cell]
+            self.expanded += 1
+            if self.g[cell] > self.rhs[cell]:
+                # The cell got closer, settle it and let its neighbours pick up the shorter distance
+                self.g[cell] = self.rhs[cell]
+            else:
+                # The cell got further or was walled off, forget its distance and work it out again
+                self.g[cell] = INF
+                self.update(cell)
+            for other in self.neighbours(cell):
+                self.update(other)
+            if visit and cell != self.start:
+                visit(*divmod(cell, self.width))
+        return self.g[self.end] < INF
+
+    # Walks back from the end along the settled distances, every way into a cell costs the same so the neighbour
+    # closest to the start is the one the path came from
+    # @ return path - list of coordinate pairs from the cell after the start up to the end, None if unreachable
+    def path(self):
+        if self.g[self.end] >= INF:
+            return None
+        path = []
+        cell = self.end
+        while cell != self.start:
+            path.append(divmod(cell, self.width))
+            cell = min((other for other in self.neighbours(cell) if self.cells[other] != WALL),
+                       key=self.g.__getitem__)
+        path.reverse()
+        return path
@@ -0,0 +1,144 @@
+from struct import Struct
+import numpy as np
+from grid import CLEAR, WALL
+from generators import GENERATORS
+
+# Layout of the header at the start of every maze file: magic, version, bits per cell, flags, height, width, start
+# row and col, end row and col, seed and wall density
+HEADER = Struct('<4sBBHIIIIIIQd')
+MAGIC = b'MAZE'
+VERSION = 1
+# Flag set when the start and end were placed in the same region
+CONNECTED = 1
+# The high byte of the flags holds the position of the maze's generator in GENERATORS, files from before generators
+# could be picked hold 0, which is the noise generator they were all built with
+GENERATOR_SHIFT = 8
+
+
+# Writes a maze to a file, packing one bit per cell, or two bits holding the cell code when the maze has mud or water,
+# with every row starting on a fresh byte so rows can be read back without unpacking the rows before them
+# @ param      path - path of the file to write
+# @ param      grid - 2D array of cell codes
+# @ param     start - coordinate pair of the start point
+# @ param       end - coordinate pair of the end point
+# @ param      seed - seed the maze was generated from
+# @ param   density - chance of each cell being a wall when the maze was generated
+# @ param connected - True if the start and end were placed in the same region
+# @ param generator - name of the algorithm the maze was generated with, one of GENERATORS
+def save(path, grid, start, end, seed, density, connected=False, generator='noise'):
+    bits = 2 if grid.max(initial=CLEAR) > WALL else 1
+    with open(path, 'wb') as file:
+        file.write(pack_header(*grid.shape, start, end, seed, density, connected, generator, bits))
+        if bits == 1:
+            file.write(np.packbits(grid == WALL, axis=1, bitorder='little').tobytes())
+        else:
+            file.write(pack_codes(grid).tobytes())
+
+
+# Writes a maze to a file one row at a time as the rows are generated, so a maze too large to hold in memory can
+# still be saved, the rows can only hold clear cells and walls
+# @ param      path - path of the file to write
+# @ param      rows - iterable of 1D arrays of cell codes, one for each row of the maze from the top down
+# @ param    height - number of rows the iterable yields
+# @ param     width - number of columns in each row
+# @ param     start - coordinate pair of the start point
+# @ param       end - coordinate pair of the end point
+# @ param      seed - seed the maze was generated from
+# @ param   density - chance of each cell being a wall when the maze was generated
+# @ param connected - True if the start and end were placed in the same region
+# @ param generator - name of the algorithm the maze was generated with, one of GENERATORS
+def stream(path, rows, height, width, start, end, seed, density, connected=False, generator='noise'):
+    with open(path, 'wb') as file:
+        file.write(pack_header(height, width, start, end, seed, density, connected, generator, 1))
+        for row in rows:
+            file.write(np.packbits(row == WALL, bitorder='little').tobytes())
+
+
+# Packs the header of a maze file
+# @  param    height - number of rows in the maze
+# @  param     width - number of columns in the maze
+# @  param     start - coordinate pair of the start point
+# @  param       end - coordinate pair of the end point
+# @  param      seed - seed the maze was generated from
+# @  param   density - chance of each cell being a wall when the maze was generated
+# @  param connected - True if the start and end were placed in the same region
+# @  param generator - name of the algorithm the maze was generated with, one of GENERATORS
+# @  param      bits - number of bits each cell is packed into, 1 or 2
+# @ return    header - bytes of the header
+def pack_header(height, width, start, end, seed, density, connected, generator, bits):
+    flags = (CONNECTED if connected else 0) | list(GENERATORS).index(generator) << GENERATOR_SHIFT
+    return HEADER.pack(MAGIC, VERSION, bits, flags, height, width, *start, *end, seed, density)
+
+
+# Packs the cell codes of a grid two bits at a time, four cells to a byte with the first cell in the lowest bits
+# @  param   grid - 2D array of cell codes, none above 3
+# @ return packed - 2D uint8 array holding the packed bytes of each row
+def pack_codes(grid):
+    height, width = grid.shape
+    padded = np.zeros((height, (width + 3) // 4 * 4), dtype=np.uint8)
+    padded[:, :width] = grid
+    quads = padded.reshape(height, -1, 4)
+    return quads[..., 0] | quads[..., 1] << 2 | quads[..., 2] << 4 | quads[..., 3] << 6
+
+
+# Unpacks cell codes packed by pack_codes
+# @  param packed - 2D uint8 array holding the packed bytes of each row
+# @  param  width - number of cells in each row
+# @ return   grid - 2D uint8 array of cell codes
+def unpack_codes(packed, width):
+    codes = (packed[..., None] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3
+    # Dropping the padding leaves a strided view, which the solvers can't take a flat memoryview of in place
+    return np.ascontiguousarray(codes.reshape(packed.shape[0], -1)[:, :width])
+
+
+# A maze file opened with its cells memory mapped, so opening costs the same however large the maze is and rows are
+# only read from disk once they are unpacked
+class MazeFile:
+
+    # @ param      path - path of the file to open
+    # @ attr    height - number of rows in the maze
+    # @ attr     width - number of columns in the maze
+    # @ attr     start - coordinate pair of the start point
+    # @ attr       end - coordinate pair of the end point
+    # @ attr      seed - seed the maze was generated from
+    # @ attr   density - chance of each cell being a wall when the maze was generated
+    # @ attr connected - True if the start and end were placed in the same region
+    # @ attr generator - name of the algorithm the maze was generated with, one of GENERATORS
+    # @ attr      bits - number of bits each cell is packed into, 2 if the maze has mud or water, else 1
+    # @ attr    packed - 2D uint8 memmap holding the packed bits of each row
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f'{path} is too short to be a maze file')
+        magic, version, self.bits, flags, self.height, self.width, *points, self.seed, self.density = \
+            HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a maze file')
+        if version != VERSION or self.bits not in (1, 2):
+            raise ValueError(f'{path} uses version {version} with {self.bits} bits per cell, which is unsupported')
+        self.start = tuple(points[:2])
+        self.end = tuple(points[2:])
+        self.connected = bool(flags & CONNECTED)
+        generators = list(GENERATORS)
+        if flags >> GENERATOR_SHIFT >= len(generators):
+            raise ValueError(f'{path} was generated by an unknown algorithm')
+        self.generator = generators[flags >> GENERATOR_SHIFT]
+        self.packed = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER.size,
+                                shape=(self.height, (self.width * self.bits + 7) // 8))
+
+    # Unpacks a range of rows into cell codes
+    # @  param    top - index of the first row
+    # @  param bottom - index one past the last row, None for the last row of the maze
+    # @ return   rows - 2D uint8 array of cell codes
+    def rows(self, top=0, bottom=None):
+        if self.bits == 2:
+            return unpack_codes(self.packed[top:bottom], self.width)
+        bits = np.unpackbits(self.packed[top:bottom], axis=1, count=self.width, bitorder='little')
+        # Walls are stored as set bits, so map them back onto the cell codes
+        return np.where(bits, WALL, CLEAR).astype(np.uint8)
+
+    # Unpacks every row of the maze
+    # @ return grid - 2D uint8 array of cell codes
+    def grid(self):
+        return self.rows()
@@ -0,0 +1,83 @@
+from cProfile import Profile
+from contextlib import contextmanager
+from time import perf_counter
+
+
+# Counters and timers collected while mazes are built, solved and drawn, shared between a solver and the Engine
+# showing it so one object tells how a slow run splits between search, rendering and waiting on the frame clock
+class Stats:
+
+    # @ attr         builds - number of mazes built
+    # @ attr  build_seconds - time spent building mazes
+    # @ attr         solves - number of solves run
+    # @ attr search_seconds - time spent solving, on whichever thread ran the solver
+    # @ attr       expanded - number of cells, jump points or graph nodes expanded over every solve
+    # @ attr       explored - number of cells reported to the observer over every solve
+    # @ attr           peak - largest frontier of any solve
+    # @ attr     heuristics - number of heuristic estimates made over every solve
+    # @ attr render_seconds - time spent drawing the maze and the solver's events
+    # @ attr         frames - number of frames presented
+    # @ attr   idle_seconds - time spent waiting for the next frame
+    def __init__(self):
+        self.reset()
+
+    # Sets every counter and timer back to zero
+    def reset(self):
+        self.builds = 0
+        self.build_seconds = 0.0
+        self.solves = 0
+        self.search_seconds = 0.0
+        self.expanded = 0
+        self.explored = 0
+        self.peak = 0
+        self.heuristics = 0
+        self.render_seconds = 0.0
+        self.frames = 0
+        self.idle_seconds = 0.0
+
+    # Adds the time spent inside a with block to one of the timers
+    # @ param name - name of the timer attribute
+    @contextmanager
+    def timer(self, name):
+        begin = perf_counter()
+        try:
+            yield
+        finally:
+            setattr(self, name, getattr(self, name) + perf_counter() - begin)
+
+    # Adds the counters of a finished solve
+    # @ param solver - Maze or TiledMaze object that just solved
+    def add_solve(self, solver):
+        self.solves += 1
+        self.expanded += solver.expanded
+        self.explored += solver.explored
+        self.peak = max(self.peak, solver.peak)
+        self.heuristics += solver.heuristics
+
+    # @ return stats - dictionary of every counter and timer, keyed by attribute name
+    def summary(self):
+        return dict(vars(self))
+
+    # Formats the stats to be shown a line at a time
+    # @ return lines - list of strings
+    def lines(self):
+        return [f'Expanded {self.expanded}',
+                f'Frontier {self.peak}',
+                f'Heuristic {self.heuristics}',
+                f'Search {self.search_seconds:.3f}s',
+                f'Render {self.render_seconds:.3f}s',
+                f'Idle {self.idle_seconds:.3f}s',
+                f'Frames {self.frames}']
+
+
+# Runs a function under cProfile and dumps the profile to a file, readable with pstats or snakeviz
+# @  param   path - path of the file the profile is written to
+# @  param   func - function to profile
+# @  param   args - arguments passed on to the function
+# @ return result - whatever the function returned
+def profile(path, func, *args):
+    profiler = Profile()
+    try:
+        return profiler.runcall(func, *args)
+    finally:
+        profiler.dump_stats(path)
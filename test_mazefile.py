@@ -0,0 +1,29 @@
+from Maze import Maze
+
+
+# Builds a maze with terrain, saves it and loads it back into a new solver
+def load_terrain_maze(path, mode):
+    solver = Maze(30, 47, connected=True, terrain=0.3)
+    solver.build_maze(7)
+    solver.save(path)
+    solver = Maze(1, 1, mode=mode)
+    solver.load(path)
+    assert solver.solve()
+    return solver
+
+
+# A maze loaded from a 2-bit file is as wide as a row of packed cells is long, walls toggled after loading it still
+# have to reach every solver
+def test_solve_after_toggle_on_loaded_maze(tmp_path):
+    solver = load_terrain_maze(tmp_path / 'maze.bin', 'best-first')
+    cell = solver.solution[len(solver.solution) // 2]
+    solver.toggle_wall(*cell)
+    solver.clear_solution()
+    assert not solver.solve() or cell not in solver.solution
+
+
+def test_repair_after_toggle_on_loaded_maze(tmp_path):
+    solver = load_terrain_maze(tmp_path / 'maze.bin', 'lpa')
+    cell = solver.solution[len(solver.solution) // 2]
+    solver.toggle_wall(*cell)
+    assert not solver.repair() or cell not in solver.solution
@@ -0,0 +1,313 @@
+from heapq import heappop, heappush
+from itertools import count
+from random import getrandbits
+import numpy as np
+from grid import CLEAR, WALL, random_grid
+from Maze import Observer, bad_coords
+from stats import Stats
+
+# Width and height in cells of each tile
+TILE = 256
+
+
+# A grid of cells stored as fixed size square tiles, a tile is only allocated the first time one of its cells is set,
+# so memory grows with the cells used rather than with the size of the grid
+class Tiles:
+
+    # @ param height - number of rows in the grid
+    # @ param  width - number of columns in the grid
+    # @ param   size - width and height in cells of each tile
+    # @ attr   tiles - dictionary mapping the row and column of each allocated tile to its 2D uint8 array
+    def __init__(self, height, width, size=TILE):
+        self.height = height
+        self.width = width
+        self.size = size
+        self.tiles = {}
+
+    # Makes the contents of a tile the first time it's needed, the base class starts every cell at 0
+    # @  param   ti - row of the tile
+    # @  param   tj - column of the tile
+    # @ return tile - 2D uint8 array, smaller than the tile size along the bottom and right edges of the grid
+    def make(self, ti, tj):
+        return np.zeros((min(self.size, self.height - ti * self.size), min(self.size, self.width - tj * self.size)),
+                        dtype=np.uint8)
+
+    # Gets a tile, making it if it doesn't exist yet
+    # @  param   ti - row of the tile
+    # @  param   tj - column of the tile
+    # @ return tile - 2D uint8 array
+    def tile(self, ti, tj):
+        tile = self.tiles.get((ti, tj))
+        if tile is None:
+            # Another thread may have made the same tile in the meantime, keep whichever was stored first
+            tile = self.tiles.setdefault((ti, tj), self.make(ti, tj))
+        return tile
+
+    # Gets a tile to read from without making it, the base class reads missing tiles as all 0
+    # @  param   ti - row of the tile
+    # @  param   tj - column of the tile
+    # @ return tile - 2D uint8 array, None if the tile doesn't exist
+    def peek(self, ti, tj):
+        return self.tiles.get((ti, tj))
+
+    # Reads one cell as grid[i, j], or copies a rectangle of cells as grid[top:bottom, left:right]
+    # @  param    key - tuple of two ints or two slices
+    # @ return        - the cell's value, or 2D uint8 array of the rectangle
+    def __getitem__(self, key):
+        i, j = key
+        if isinstance(i, slice):
+            (top, bottom, _), (left, right, _) = i.indices(self.height), j.indices(self.width)
+            return self.window(top, left, bottom, right)
+        tile = self.peek(i // self.size, j // self.size)
+        return 0 if tile is None else int(tile[i % self.size, j % self.size])
+
+    # Sets one cell as grid[i, j] = value
+    # @ param   key - tuple containing the row and column of the cell
+    # @ param value - new value of the cell
+    def __setitem__(self, key, value):
+        i, j = key
+        self.tile(i // self.size, j // self.size)[i % self.size, j % self.size] = value
+
+    # Sets many cells at once, where a cell is given more than once the last value given wins
+    # @ param   rows - 1D array of the rows of the cells
+    # @ param   cols - 1D array of the columns of the cells
+    # @ param values - 1D array of the new values of the cells, or a single value for all of them
+    def put(self, rows, cols, values):
+        rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+        values = np.broadcast_to(np.asarray(values, dtype=np.uint8), rows.shape)
+        keys = rows // self.size * ((self.width + self.size - 1) // self.size) + cols // self.size
+        # Group the cells by tile, a stable sort keeps the cells of each tile in the order they were given
+        order = np.argsort(keys, kind='stable')
+        keys, rows, cols, values = keys[order], rows[order], cols[order], values[order]
+        bounds = np.flatnonzero(np.diff(keys)) + 1
+        for begin, end in zip(np.concatenate(([0], bounds)).tolist(), np.concatenate((bounds, [keys.size])).tolist()):
+            if begin == end:
+                continue
+            tile = self.tile(int(rows[begin]) // self.size, int(cols[begin]) // self.size)
+            tile[rows[begin:end] % self.size, cols[begin:end] % self.size] = values[begin:end]
+
+    # Copies a rectangle of cells out of every tile it overlaps
+    # @  param    top - row of the first cell
+    # @  param   left - column of the first cell
+    # @  param bottom - row one past the last cell
+    # @  param  right - column one past the last cell
+    # @ return window - 2D uint8 array of the cells
+    def window(self, top, left, bottom, right):
+        window = np.zeros((max(bottom - top, 0), max(right - left, 0)), dtype=np.uint8)
+        size = self.size
+        for ti in range(top // size, (bottom - 1) // size + 1):
+            for tj in range(left // size, (right - 1) // size + 1):
+                tile = self.peek(ti, tj)
+                if tile is None:
+                    continue
+                # Overlap of the tile and the window in grid coordinates
+                i0, i1 = max(top, ti * size), min(bottom, (ti + 1) * size)
+                j0, j1 = max(left, tj * size), min(right, (tj + 1) * size)
+                window[i0 - top:i1 - top, j0 - left:j1 - left] = tile[i0 - ti * size:i1 - ti * size,
+                                                                      j0 - tj * size:j1 - tj * size]
+        return window
+
+
+# A maze grid too large to hold at once, each tile's walls are drawn from its own seed the first time it's read so
+# any part of the maze can be rebuilt without generating the rest
+class TiledGrid(Tiles):
+
+    # @ param    height - number of rows in the grid
+    # @ param     width - number of columns in the grid
+    # @ param      seed - seed of the maze, combined with a tile's row and column to seed that tile
+    # @ param   density - chance of each cell being a wall
+    # @ param    points - coordinate pairs of cells that are always clear, like the start and end
+    # @ param      size - width and height in cells of each tile
+    def __init__(self, height, width, seed, density=1 / 3, points=(), size=TILE):
+        super().__init__(height, width, size)
+        self.seed = seed
+        self.density = density
+        self.points = points
+
+    # Draws the walls of a tile
+    # @  param   ti - row of the tile
+    # @  param   tj - column of the tile
+    # @ return tile - 2D uint8 array of cell codes
+    def make(self, ti, tj):
+        rng = np.random.default_rng((self.seed, ti, tj))
+        tile = random_grid(rng, min(self.size, self.height - ti * self.size),
+                           min(self.size, self.width - tj * self.size), self.density)
+        for i, j in self.points:
+            if (i // self.size, j // self.size) == (ti, tj):
+                tile[i % self.size, j % self.size] = CLEAR
+        return tile
+
+    # Every tile can be rebuilt from the seed, so reading a tile makes it
+    def peek(self, ti, tj):
+        return self.tile(ti, tj)
+
+
+# A maze stored as a TiledGrid, solved best first with the search's memory kept in dictionaries so both the grid
+# and the search only grow with the cells the search reaches
+class TiledMaze:
+
+    # @ param     height - number of rows in the maze
+    # @ param      width - number of columns in the maze
+    # @ param   observer - Observer object notified of solver events, None to solve without a display
+    # @ param   max_path - maximum number of paths the algorithm will advance on each iteration
+    # @ param    density - chance of each cell in a new maze being a wall
+    # @ param     pocket - number of cells a region must reach before it's assumed to be open maze
+    # @ param      stats - Stats object the counters and timers of every build and solve are added to, None for a
+    #                      new one
+    # @  attr       maze - TiledGrid object containing the cell codes of the maze
+    # @  attr       seed - seed the current maze was generated from
+    # @  attr      start - coordinates of the start point
+    # @  attr        end - coordinates of the end point
+    # @  attr   solution - list of the coordinates used to traverse the path found
+    # @  attr    parents - dictionary mapping each checked cell to the cell it was reached from
+    # @  attr   explored - number of cells checked while solving the maze, excluding the start
+    # @  attr   expanded - number of cells whose moves were generated while solving the maze
+    # @  attr       peak - largest number of paths waiting in the frontier at once while solving the maze
+    # @  attr      paths - heap of the last cell of each active path being checked while solving the maze
+    # @  attr      order - counter that breaks distance ties between paths in the order they were created
+    # @  attr heuristics - number of heuristic estimates made while solving the maze
+    def __init__(self, height, width, observer=None, max_path=16, density=1 / 3, pocket=4096, stats=None):
+        self.height = height
+        self.width = width
+        self.observer = observer if observer else Observer()
+        self.max_paths = max_path
+        self.density = density
+        self.pocket = pocket
+        self.stats = stats if stats else Stats()
+        self.maze = None
+        self.seed = None
+        self.start = (0, 0)
+        self.end = (0, 0)
+        self.solution = []
+        self.parents = {}
+        self.explored = 0
+        self.expanded = 0
+        self.peak = 0
+        self.paths = []
+        self.order = count()
+        self.heuristics = 0
+
+    # Updates the dimensions of the maze
+    # @ param height - number of desired rows in the maze
+    # @ param  width - number of desired columns in the maze
+    def set_dimensions(self, height, width):
+        self.height = height
+        self.width = width
+
+    # Clears memory involved in solving the maze
+    def clear_solution(self):
+        self.solution = []
+        self.parents = {self.start: None}
+        self.explored = 0
+        self.expanded = 0
+        self.peak = 1
+        self.heuristics = 0
+        self.order = count()
+        self.paths = [(self.distance(self.start), next(self.order), self.start)]
+
+    # Constructs a new randomly generated maze, no walls are drawn until the tiles holding them are read
+    # @  param      seed - seed for the random number generator, None to pick a new one
+    # @ return self.maze - newly constructed maze
+    def build_maze(self, seed=None):
+        self.stats.builds += 1
+        self.seed = getrandbits(32) if seed is None else seed
+        rng = np.random.default_rng(self.seed)
+        self.start = int(rng.integers(self.height)), int(rng.integers(self.width))
+        self.end = self.start
+        while bad_coords(self.start, self.end):
+            self.end = int(rng.integers(self.height)), int(rng.integers(self.width))
+        self.maze = TiledGrid(self.height, self.width, self.seed, self.density, (self.start, self.end))
+        self.clear_solution()
+        return self.maze
+
+    # Solve the maze by always advancing the paths that end closest to the end point
+    # return  True - if a solution to the maze is found
+    # return False - if no solution is found
+    def solve(self):
+        if self.maze is None or not self.reachable():
+            return False
+        with self.stats.timer('search_seconds'):
+            solved = self.best_first()
+        self.stats.add_solve(self)
+        return solved
+
+    # Advances the paths that end closest to the end point until one reaches it
+    # return  True - if a solution to the maze is found
+    # return False - if no solution is found
+    def best_first(self):
+        while self.paths:
+            num_paths = min(len(self.paths), self.max_paths)
+            new_paths = []
+            for _ in range(num_paths):
+                self.observer.step()
+                node = heappop(self.paths)[2]
+                self.expanded += 1
+                for move in self.get_moves(*node):
+                    if move in self.parents:
+                        continue
+                    if move == self.end:
+                        self.solution = self.trace(node)
+                        self.observer.solved(self.solution)
+                        return True
+                    new_paths.append((self.distance(move), next(self.order), move))
+                    self.parents[move] = node
+                    self.explored += 1
+                    self.observer.explore(*move)
+            for path in new_paths:
+                heappush(self.paths, path)
+            self.peak = max(self.peak, len(self.paths))
+        return False
+
+    # Determines if the end can be reached, without labelling every region of a maze this size
+    #
+    # A region smaller than the pocket size is flooded whole, so the answer is exact when the start or end is walled
+    # into a pocket. Two regions larger than that are assumed to be the same open maze.
+    # @ return True - if the end may be reachable from the start
+    def reachable(self):
+        for point, other in ((self.start, self.end), (self.end, self.start)):
+            region = self.flood(point)
+            if region is not None:
+                return other in region
+        return True
+
+    # Floods the region around a cell, giving up once it reaches the pocket size
+    # @  param  point - coordinate pair the flood starts from
+    # @ return region - set of the coordinate pairs in the region, None if the region is at least the pocket size
+    def flood(self, point):
+        region = {point}
+        stack = [point]
+        while stack:
+            for move in self.get_moves(*stack.pop()):
+                if move not in region:
+                    if len(region) >= self.pocket:
+                        return None
+                    region.add(move)
+                    stack.append(move)
+        return region
+
+    # Rebuilds the path leading to a checked cell by following the parent of each cell back to the start
+    # @  param node - coordinate pair of the last cell on the path
+    # @ return path - list of coordinate pairs from the cell after the start up to the given cell
+    def trace(self, node):
+        path = []
+        while node != self.start:
+            path.append(node)
+            node = self.parents[node]
+        path.reverse()
+        return path
+
+    # Generates the moves from a given coordinate pair that don't run into a wall, reading in tiles as needed
+    # param        i - row value of coordinate pair
+    # param        j - col value of coordinate pair
+    # yield row, col - Coordinate pair of a clear cell next to the given coordinates
+    def get_moves(self, i, j):
+        for row, col in ((i, j + 1), (i + 1, j), (i, j - 1), (i - 1, j)):
+            if 0 <= row < self.height and 0 <= col < self.width and self.maze[row, col] != WALL:
+                yield row, col
+
+    # Calculates the Manhattan distance between given coordinates and the end coordinate
+    # @  param coords - coordinate pair to be checked
+    # @ return        - Manhattan distance
+    def distance(self, coords):
+        self.heuristics += 1
+        return abs(coords[0] - self.end[0]) + abs(coords[1] - self.end[1])
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+import numpy as np
+from grid import WALL
+
+
+# Builds a mask for each move in the order of Maze.get_directions, flagging the cells that move leads out of onto
+# a clear cell, along with the change in flat index that move makes
+# @  param  grid - 2D array of cell codes
+# @ return moves - list of (mask, offset) tuples for the east, south, west and north moves
+def shifted_masks(grid):
+    width = grid.shape[1]
+    clear = grid != WALL
+    east, south, west, north = (np.zeros_like(clear) for _ in range(4))
+    east[:, :-1] = clear[:, :-1] & clear[:, 1:]
+    south[:-1, :] = clear[:-1, :] & clear[1:, :]
+    west[:, 1:] = clear[:, 1:] & clear[:, :-1]
+    north[1:, :] = clear[1:, :] & clear[:-1, :]
+    return [(east.reshape(-1), 1), (south.reshape(-1), width), (west.reshape(-1), -1), (north.reshape(-1), -width)]
+
+
+# Expands a breadth first search one whole frontier at a time, recording how many moves each cell is from the source
+# @  param   grid - 2D array of cell codes
+# @  param source - coordinate pair the search starts from
+# @  param target - coordinate pair to stop at once reached, None to fill every reachable cell
+# @  param  visit - function called with the flat indexes of each new frontier, None to skip
+# @ return   dist - 2D int32 array of distances from the source, -1 for cells that weren't reached
+def distance_field(grid, source, target=None, visit=None):
+    height, width = grid.shape
+    dist = np.full(height * width, -1, dtype=np.int32)
+    stop = -1 if target is None else target[0] * width + target[1]
+    spread(dist, np.array([source[0] * width + source[1]]), shifted_masks(grid), stop, visit)
+    return dist.reshape(height, width)
+
+
+# Grows breadth first searches from every cell of a frontier at once until they run out of cells or reach a stop
+# @ param     dist - flat int32 array of distances, -1 for cells not reached yet, filled in place
+# @ param frontier - array of flat indexes of the cells the searches start from
+# @ param    moves - list of (mask, offset) tuples as returned by shifted_masks
+# @ param     stop - flat index of the cell to stop at once reached, -1 to fill every reachable cell
+# @ param    visit - function called with the flat indexes of each new frontier, None to skip
+def spread(dist, frontier, moves, stop=-1, visit=None):
+    dist[frontier] = 0
+    step = 0
+    slots = np.empty(dist.size, dtype=np.int32)
+    while frontier.size:
+        if stop >= 0 and dist[stop] >= 0:
+            break
+        step += 1
+        reached = np.concatenate([frontier[mask[frontier]] + offset for mask, offset in moves])
+        reached = reached[dist[reached] < 0]
+        # Two cells of the frontier may share a neighbour, each copy writes its position into the cell's slot and
+        # only the copy whose write landed last is kept, which removes duplicates without sorting
+        order = np.arange(reached.size, dtype=np.int32)
+        slots[reached] = order
+        reached = reached[slots[reached] == order]
+        dist[reached] = step
+        frontier = reached
+        if visit and frontier.size:
+            visit(frontier)
+
+
+# Walks a distance field back downhill from a target to its source
+# @  param   dist - 2D array of distances returned by distance_field
+# @  param target - coordinate pair to walk back from
+# @ return   path - list of coordinate pairs from the cell after the source up to the target, None if unreachable
+def walk_back(dist, target):
+    height, width = dist.shape
+    i, j = target
+    if dist[i, j] < 0:
+        return None
+    path = []
+    while dist[i, j] > 0:
+        path.append((i, j))
+        step = dist[i, j] - 1
+        # Any neighbour one move closer to the source is on a shortest path, prefer them in the east, south, west,
+        # north order of Maze.get_directions
+        for row, col in (i, j + 1), (i + 1, j), (i, j - 1), (i - 1, j):
+            if 0 <= row < height and 0 <= col < width and dist[row, col] == step:
+                i, j = row, col
+                break
+    path.reverse()
+    return path
+
+
+# Least recently used cache of full distance fields for one grid, each field answers every path query to or from
+# the cell it was grown from, since moves on the grid can be taken in either direction
+class FieldCache:
+
+    # @ param capacity - maximum number of distance fields kept at once
+    # @  attr   fields - OrderedDict mapping each anchor cell to its distance field, least recently used first
+    # @  attr     hits - number of queries answered from a cached field
+    # @  attr   misses - number of queries that had to grow a new field
+    # @  attr  reached - number of cells reached growing a field for the last lookup, 0 if it was cached
+    # @  attr   widest - largest frontier met growing a field for the last lookup, 0 if it was cached
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self.fields = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.reached = 0
+        self.widest = 0
+
+    # Drops every cached field, must be called whenever the grid changes
+    def clear(self):
+        self.fields.clear()
+
+    # Gets the distance field grown from a cell, growing and caching it if needed
+    # @  param   grid - 2D array of cell codes
+    # @  param anchor - coordinate pair the field is grown from
+    # @ return  field - 2D array of distances from the anchor, -1 for cells that can't be reached
+    def field(self, grid, anchor):
+        field = self.fields.get(anchor)
+        if field is None:
+            self.misses += 1
+            field = self.fields[anchor] = distance_field(grid, anchor)
+            if len(self.fields) > self.capacity:
+                self.fields.popitem(last=False)
+            # Every frontier holds the cells at one distance, so counting the cells at each distance sizes them all
+            layers = np.bincount(field[field >= 0])
+            self.reached = int(layers.sum())
+            self.widest = int(layers.max())
+        else:
+            self.hits += 1
+            self.reached = 0
+            self.widest = 0
+            self.fields.move_to_end(anchor)
+        return field
+
+    # Finds a shortest path between two cells, reusing a field grown from either of them when there is one
+    # @  param    grid - 2D array of cell codes
+    # @  param  source - coordinate pair the path leaves from
+    # @  param  target - coordinate pair the path arrives at
+    # @ return    path - list of coordinate pairs strictly between the source and target, None if unreachable
+    def path(self, grid, source, target):
+        if source in self.fields and target not in self.fields:
+            path = walk_back(self.field(grid, source), target)
+            return None if path is None else path[:-1]
+        # Walking down the target's field runs from the source towards the target, so reverse it
+        path = walk_back(self.field(grid, target), source)
+        return None if path is None else path[::-1][1:]
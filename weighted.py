@@ -0,0 +1,129 @@
+from grid import COSTS, astar
+
+
+# A* over a grid whose cells cost different amounts to move onto, using the Manhattan distance as the heuristic since
+# no cell costs less than 1
+#
+# With small integer costs every key on the open list is a small integer, and since the heuristic is consistent a
+# cell is never pushed with a key lower than the one being expanded, nor more than the largest cost plus one above it.
+# Dial's algorithm keeps one bucket for each key in a ring that long, so pushing and popping are list appends and pops
+# rather than heap operations. The same search can run on a binary heap instead, to compare the two.
+class WeightedSearch:
+
+    # @ param       grid - 2D array of cell codes
+    # @ param      start - coordinate pair the search starts from
+    # @ param        end - coordinate pair the search is looking for
+    # @ param      visit - function called with the coordinates of each cell pushed, None to skip
+    # @  attr      costs - flat view holding the cost of moving onto each cell, 0 for walls
+    # @  attr       cost - dictionary mapping each cell the last Dial run reached to the cost of the cheapest known
+    #                      path to it
+    # @  attr     parent - dictionary mapping each cell the last Dial run reached to the cell it was reached from
+    # @  attr   expanded - number of cells expanded
+    # @  attr       peak - largest number of entries on the open list at once
+    # @  attr heuristics - number of heuristic estimates made
+    def __init__(self, grid, start, end, visit=None):
+        self.height, self.width = grid.shape
+        self.costs = memoryview(COSTS[grid].reshape(-1))
+        self.start = start[0] * self.width + start[1]
+        self.end = end[0] * self.width + end[1]
+        self.visit = visit
+        self.reset()
+
+    # Forgets any earlier search, so each run starts from the start alone with its counters at zero
+    def reset(self):
+        self.cost = {self.start: 0}
+        self.parent = {self.start: None}
+        self.expanded = 0
+        self.peak = 1
+        self.heuristics = 0
+
+    # Estimates the cost of the rest of the path from a cell
+    # @  param cell - flat index of the cell
+    # @ return      - Manhattan distance from the cell to the end
+    def estimate(self, cell):
+        self.heuristics += 1
+        i, j = divmod(cell, self.width)
+        ei, ej = divmod(self.end, self.width)
+        return abs(i - ei) + abs(j - ej)
+
+    # Generates the cells next to a cell that can be moved onto
+    # @  param   cell - flat index of the cell
+    # @  param parent - flat index of the cell it was reached from, unused since every direction is open
+    # @ yield         - tuple containing the flat index of the neighbour and the cost of moving onto it
+    def moves(self, cell, parent=None):
+        i, j = divmod(cell, self.width)
+        for other, inside in ((cell + 1, j + 1 < self.width), (cell + self.width, i + 1 < self.height),
+                              (cell - 1, j > 0), (cell - self.width, i > 0)):
+            if inside and self.costs[other]:
+                yield other, self.costs[other]
+
+    # Generates the neighbours a cell gives a cheaper path to, recording the new paths as it goes
+    # @  param  cell - flat index of the cell being expanded
+    # @ yield        - tuple containing the flat index of the neighbour and its key, the cost of the path to it plus
+    #                  the estimate of the rest
+    def relax(self, cell):
+        base = self.cost[cell]
+        for other, step in self.moves(cell):
+            new_cost = base + step
+            if new_cost < self.cost.get(other, new_cost + 1):
+                self.cost[other] = new_cost
+                self.parent[other] = cell
+                if self.visit and other != self.end:
+                    self.visit(*divmod(other, self.width))
+                yield other, new_cost + self.estimate(other)
+
+    # Runs the search with Dial's bucket queue
+    # @ return path - list of coordinate pairs from the cell after the start up to the end, None if unreachable
+    def dial(self):
+        self.reset()
+        # Keys pushed are at most the largest cost plus one above the key being expanded, so a ring one longer than
+        # that never wraps onto a bucket still in use
+        ring = int(COSTS.max()) + 2
+        buckets = [[] for _ in range(ring)]
+        key = self.estimate(self.start)
+        buckets[key % ring].append((self.start, 0))
+        queued = 1
+        while queued:
+            bucket = buckets[key % ring]
+            if not bucket:
+                key += 1
+                continue
+            # Popping the last cell pushed breaks ties towards the longest path so far, as in jps
+            cell, cost = bucket.pop()
+            queued -= 1
+            # Skip entries made stale by a cheaper path found after they were pushed
+            if cost > self.cost[cell]:
+                continue
+            if cell == self.end:
+                return self.path()
+            self.expanded += 1
+            for other, total in self.relax(cell):
+                buckets[total % ring].append((other, self.cost[other]))
+                queued += 1
+            self.peak = max(self.peak, queued)
+        return None
+
+    # Runs the search with a binary heap as the open list
+    # @ return path - list of coordinate pairs from the cell after the start up to the end, None if unreachable
+    def heap(self):
+        self.reset()
+        route, self.expanded, self.peak = astar(self.start, self.end, self.moves, self.estimate,
+                                                self.visit and (lambda cell: self.visit(*divmod(cell, self.width))))
+        return None if route is None else [divmod(cell, self.width) for cell in route[1:]]
+
+    # Walks back from the end along the parents recorded by the last Dial run
+    # @ return path - list of coordinate pairs from the cell after the start up to the end
+    def path(self):
+        path = []
+        cell = self.end
+        while cell != self.start:
+            path.append(divmod(cell, self.width))
+            cell = self.parent[cell]
+        path.reverse()
+        return path
+
+    # Adds up the cost of moving along a path
+    # @  param path - list of coordinate pairs from the cell after the start up to the end, None if unreachable
+    # @ return      - total cost of the moves, None if there is no path
+    def price(self, path):
+        return None if path is None else sum(self.costs[i * self.width + j] for i, j in path)
@@ -0,0 +1,105 @@
+from threading import Event, Thread
+from Maze import Observer
+from eventlog import EventLog
+
+
+# Raised inside the solver's thread to unwind a solve that was cancelled
+class Cancelled(Exception):
+    pass
+
+
+# Records the solver's events so another thread can replay them later, the solver only ever appends to the log and
+# the replay only ever reads the steps already counted in it, so neither side takes a lock
+class EventQueue(Observer):
+
+    # @ attr       log - EventLog object the events of the current solve are recorded in
+    # @ attr  position - index of the next step of the log to replay
+    # @ attr cancelled - threading Event set to stop the solve at its next step
+    def __init__(self):
+        self.log = EventLog()
+        self.position = 0
+        self.cancelled = Event()
+
+    # Stops the solve if it was cancelled
+    def step(self):
+        if self.cancelled.is_set():
+            raise Cancelled
+
+    # Records a cell added to the frontier
+    # @ param        i - ordinal row value of the cell
+    # @ param        j - ordinal column value of the cell
+    # @ param backward - True if the cell was reached by a search running from the end back to the start
+    def explore(self, i, j, backward=False):
+        self.log.explore(i, j, backward)
+
+    # Records the solution once the end is reached
+    # @ param solution - list of tuples containing the coordinate pairs of all cells from the solution
+    def solved(self, solution):
+        self.log.solved(solution)
+
+    # @ return True - if there are recorded events that haven't been replayed yet
+    def pending(self):
+        return self.position < len(self.log)
+
+    # Drops the log, ready to record a new solve
+    def clear(self):
+        self.log = EventLog()
+        self.position = 0
+
+    # Replays recorded events onto another observer in the order they were recorded
+    # @  param observer - Observer object the events are replayed onto
+    # @  param    limit - maximum number of events to replay, 0 for no limit
+    # @  param deadline - function returning True once replaying should stop, None to replay up to the limit
+    # @ return    count - number of events replayed
+    def drain(self, observer, limit=0, deadline=None):
+        count = 0
+        while self.position < len(self.log) and (not limit or count < limit):
+            self.log.replay(observer, self.position)
+            self.position += 1
+            count += 1
+            # Checking the clock is slower than replaying an event, so only check it every so often
+            if deadline and not count % 256 and deadline():
+                break
+        return count
+
+
+# Runs a maze's solver on a background thread, posting its events to an EventQueue
+class SolveWorker:
+
+    # @ param   maze - Maze object to solve, its observer must be the given queue
+    # @ param  queue - EventQueue object the solver posts its events to
+    # @ attr thread - threading Thread object running the solve, None until started
+    # @ attr result - True if a solution was found, False if not, None while running or if cancelled
+    def __init__(self, maze, queue):
+        self.maze = maze
+        self.queue = queue
+        self.thread = None
+        self.result = None
+
+    # Starts solving on a new daemon thread, so a running solve never keeps the program from exiting
+    def start(self):
+        self.queue.clear()
+        self.queue.cancelled.clear()
+        self.result = None
+        self.thread = Thread(target=self.run, name='solver', daemon=True)
+        self.thread.start()
+
+    # Body of the solver's thread
+    def run(self):
+        try:
+            self.result = self.maze.solve()
+            self.queue.log.complete = True
+        except Cancelled:
+            pass
+
+    # @ return True - if the solve is still running
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    # Stops a running solve and waits for its thread to finish, then drops the part of the log it left behind
+    def cancel(self):
+        if not self.running():
+            return
+        self.queue.cancelled.set()
+        self.thread.join()
+        self.queue.clear()